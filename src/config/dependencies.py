@@ -1,39 +1,86 @@
-import os
+from functools import lru_cache
 
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.config.settings import TestingSettings, Settings, BaseAppSettings
+from fastapi import Depends
+from src.config.settings import BaseAppSettings
 
-# from src.database import get_db, UserModel
-from src.config.get_settings import get_settings
+from src.config.get_settings import get_app_settings
 from src.notifications import EmailSenderInterface, EmailSender
 from src.security.interfaces import JWTAuthManagerInterface
 from src.security.token_manager import JWTAuthManager
 from src.storages import S3StorageInterface, S3StorageClient
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from src.exceptions import TokenExpiredError, InvalidTokenError
+
+@lru_cache(maxsize=1)
+def _build_jwt_auth_manager(
+    secret_key_access: str, secret_key_refresh: str, algorithm: str
+) -> JWTAuthManagerInterface:
+    return JWTAuthManager(
+        secret_key_access=secret_key_access,
+        secret_key_refresh=secret_key_refresh,
+        algorithm=algorithm,
+    )
 
 
-bearer_scheme = HTTPBearer(auto_error=False)
+@lru_cache(maxsize=1)
+def _build_email_sender(
+    hostname: str,
+    port: int,
+    email: str,
+    password: str,
+    use_tls: bool,
+    template_dir: str,
+    activation_email_template_name: str,
+    activation_complete_email_template_name: str,
+    password_email_template_name: str,
+    password_complete_email_template_name: str,
+    comment_reply_template_name: str,
+    comment_like_template_name: str,
+    payment_email_template_name: str,
+) -> EmailSenderInterface:
+    return EmailSender(
+        hostname=hostname,
+        port=port,
+        email=email,
+        password=password,
+        use_tls=use_tls,
+        template_dir=template_dir,
+        activation_email_template_name=activation_email_template_name,
+        activation_complete_email_template_name=activation_complete_email_template_name,
+        password_email_template_name=password_email_template_name,
+        password_complete_email_template_name=password_complete_email_template_name,
+        comment_reply_template_name=comment_reply_template_name,
+        comment_like_template_name=comment_like_template_name,
+        payment_email_template_name=payment_email_template_name,
+    )
 
 
-def get_jwt_auth_manager(
-    settings: BaseAppSettings = Depends(get_settings),
+@lru_cache(maxsize=1)
+def _build_s3_storage_client(
+    endpoint_url: str, access_key: str, secret_key: str, bucket_name: str
+) -> S3StorageInterface:
+    return S3StorageClient(
+        endpoint_url=endpoint_url,
+        access_key=access_key,
+        secret_key=secret_key,
+        bucket_name=bucket_name,
+    )
+
+
+async def get_jwt_auth_manager(
+    settings: BaseAppSettings = Depends(get_app_settings),
 ) -> JWTAuthManagerInterface:
-    return JWTAuthManager(
-        secret_key_access=settings.SECRET_KEY_ACCESS,
-        secret_key_refresh=settings.SECRET_KEY_REFRESH,
-        algorithm=settings.JWT_SIGNING_ALGORITHM,
+    return _build_jwt_auth_manager(
+        settings.SECRET_KEY_ACCESS,
+        settings.SECRET_KEY_REFRESH,
+        settings.JWT_SIGNING_ALGORITHM,
     )
 
 
-def get_accounts_email_notificator(
-    settings: BaseAppSettings = Depends(get_settings),
+async def get_accounts_email_notificator(
+    settings: BaseAppSettings = Depends(get_app_settings),
 ) -> EmailSenderInterface:
 
-    return EmailSender(
+    return _build_email_sender(
         hostname=settings.EMAIL_HOST,
         port=settings.EMAIL_PORT,
         email=settings.EMAIL_HOST_USER,
@@ -50,11 +97,11 @@ def get_accounts_email_notificator(
     )
 
 
-def get_s3_storage_client(
-    settings: BaseAppSettings = Depends(get_settings),
+async def get_s3_storage_client(
+    settings: BaseAppSettings = Depends(get_app_settings),
 ) -> S3StorageInterface:
 
-    return S3StorageClient(
+    return _build_s3_storage_client(
         endpoint_url=settings.S3_STORAGE_ENDPOINT,
         access_key=settings.S3_STORAGE_ACCESS_KEY,
         secret_key=settings.S3_STORAGE_SECRET_KEY,
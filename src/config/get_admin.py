@@ -1,16 +1,15 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer
-from src.database import UserModel, UserGroupEnum
+from src.database import UserModel, UserGroupEnum, USER_GROUP_MASKS
 from src.config.get_current_user import get_current_user
 
+ADMIN_MASK = USER_GROUP_MASKS[UserGroupEnum.ADMIN]
+MODERATOR_OR_ADMIN_MASK = USER_GROUP_MASKS[UserGroupEnum.MODERATOR] | ADMIN_MASK
 
-bearer_scheme = HTTPBearer(auto_error=False)
 
-
-def require_admin(user: UserModel = Depends(get_current_user)) -> UserModel:
+async def require_admin(user: UserModel = Depends(get_current_user)) -> UserModel:
     """Allow access only to users with ADMIN privileges."""
 
-    if not user.has_group(UserGroupEnum.ADMIN):
+    if not user.role_mask & ADMIN_MASK:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
         )
@@ -22,9 +21,7 @@ async def require_moderator_or_admin(
 ) -> UserModel:
     """Allow access to users with MODERATOR or ADMIN privileges."""
 
-    if not (
-        user.has_group(UserGroupEnum.MODERATOR) or user.has_group(UserGroupEnum.ADMIN)
-    ):
+    if not user.role_mask & MODERATOR_OR_ADMIN_MASK:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Moderator or Admin access required",
@@ -1,65 +1,295 @@
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+import asyncio
+import base64
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
+import aioredis
 from aioredis import Redis
-from src.config import get_jwt_auth_manager
-from src.database import get_db, UserModel
+from src.config import get_jwt_auth_manager, BaseAppSettings
+from src.config.get_settings import get_app_settings
+from src.database import get_db, UserModel, UserGroupModel, UserGroupEnum
 from src.security.interfaces import JWTAuthManagerInterface
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from src.tasks.redis_blacklist import get_redis, is_token_revoked
+from src.security.http import get_bearer_token
+from src.security.token_manager import JWTAuthManager
+from src.tasks.redis_blacklist import (
+    REVOCATION_CHANNEL,
+    get_redis,
+    is_token_revoked,
+    token_cache_key,
+    evict_on_revocation,
+    evict_on_user_invalidation,
+    user_invalidation_message,
+)
 from src.exceptions import TokenExpiredError, InvalidTokenError
+from src.security.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Detached user instances (with their group loaded) keyed by user id. They are
+# never attached to a session themselves; each request merges a copy. Entries
+# are evicted in every worker when any of them invalidates the user.
+_user_cache = TTLCache(maxsize=10_000, ttl=15)
+evict_on_user_invalidation(_user_cache)
+
+# Verified access token payloads keyed by token digest. An entry never outlives
+# the token's `exp` claim and is evicted when the token is revoked.
+_verified_payloads = TTLCache(maxsize=50_000, ttl=60)
+evict_on_revocation(_verified_payloads)
+
+
+# The same users are shared between workers through Redis, so a cold process
+# still skips the database for users other workers just loaded. Only these
+# plain columns are stored, as JSON; the password hash never leaves the
+# database and is loaded on access when a request needs it.
+SHARED_USER_CACHE_TTL = 30
+SHARED_USER_FIELDS = ("id", "email", "group_id", "is_active")
+SHARED_USER_DATETIME_FIELDS = ("created_at", "updated_at")
+
+# Users are read from the database as the same columns, so a user built from
+# a database row and one built from Redis have exactly the same attributes
+# loaded: those columns and the group.
+_USER_COLUMNS_BY_ID = select(
+    *(
+        getattr(UserModel, field)
+        for field in SHARED_USER_FIELDS + SHARED_USER_DATETIME_FIELDS
+    )
+).where(UserModel.id == bindparam("user_id"))
+
+
+def _shared_user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def _get_shared_user(redis: Redis, user_id: int) -> dict | None:
+    """Return a user's cached columns, or None if they are not cached."""
+    try:
+        raw = await redis.get(_shared_user_key(user_id))
+    except aioredis.RedisError:
+        return None
+    if raw is None:
+        return None
+    try:
+        data = json.loads(raw)
+        values = {field: data[field] for field in SHARED_USER_FIELDS}
+        for field in SHARED_USER_DATETIME_FIELDS:
+            values[field] = datetime.fromisoformat(data[field])
+    except (ValueError, TypeError, KeyError):
+        logger.warning("Ignoring malformed cached user %s in Redis", user_id)
+        return None
+    return values
+
+
+async def _set_shared_user(redis: Redis, values: dict) -> None:
+    data = {field: values[field] for field in SHARED_USER_FIELDS}
+    for field in SHARED_USER_DATETIME_FIELDS:
+        data[field] = values[field].isoformat()
+    raw = json.dumps(data)
+    try:
+        await redis.set(_shared_user_key(values["id"]), raw, ex=SHARED_USER_CACHE_TTL)
+    except aioredis.RedisError:
+        logger.warning("Could not cache user %s in Redis", values["id"])
+
+
+async def invalidate_cached_user(user_id: int, redis: Redis) -> None:
+    """
+    Drop the cached copies of a user after its row has been modified.
+
+    The copy in Redis is deleted, and every worker is told to drop its
+    in-process copy.
+    """
+    _user_cache.pop(user_id)
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(_shared_user_key(user_id))
+            pipe.publish(REVOCATION_CHANNEL, user_invalidation_message(user_id))
+            await pipe.execute()
+    except aioredis.RedisError:
+        logger.warning("Could not drop cached user %s from Redis", user_id)
+
+
+# Detached user groups keyed by id. The table holds a handful of static rows,
+# so it is read once instead of being joined into every user lookup.
+_groups: dict[int, UserGroupModel] = {}
+
+
+async def load_user_groups(db: AsyncSession) -> None:
+    """(Re)load the detached user groups used to resolve `UserModel.group`."""
+    groups = (await db.execute(select(UserGroupModel))).scalars().all()
+    for group in groups:
+        db.expunge(group)
+    _groups.clear()
+    _groups.update((group.id, group) for group in groups)
+
+
+async def _get_group(db: AsyncSession, group_id: int) -> UserGroupModel:
+    if group_id not in _groups:
+        await load_user_groups(db)
+    return _groups[group_id]
+
+
+def _find_group_id(name: UserGroupEnum) -> Optional[int]:
+    for group in _groups.values():
+        if group.name == name:
+            return group.id
+    return None
 
 
-bearer_scheme = HTTPBearer(auto_error=False)
+async def get_user_group_id(db: AsyncSession, name: UserGroupEnum) -> Optional[int]:
+    """
+    Return the id of the user group called `name`, or None if there is none.
+
+    Groups are effectively static, so they are looked up in the cached map
+    and only reloaded when `name` is missing from it.
+    """
+    group_id = _find_group_id(name)
+    if group_id is None:
+        await load_user_groups(db)
+        group_id = _find_group_id(name)
+    return group_id
+
+
+def clear_user_cache() -> None:
+    """Drop all cached users, user groups and verified token payloads."""
+    _user_cache.clear()
+    _groups.clear()
+    _verified_payloads.clear()
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _peek_jwt(token: str, algorithm: str) -> None:
+    """
+    Cheaply reject malformed, foreign-algorithm or expired tokens.
+
+    Only the header and payload segments are decoded; the signature is not
+    checked here, so this never replaces `decode_access_token`.
+
+    Raises:
+        InvalidTokenError: If the token is malformed or uses another algorithm.
+        TokenExpiredError: If the `exp` claim is in the past.
+    """
+    try:
+        header_segment, payload_segment, _ = token.split(".", 2)
+        header = json.loads(_b64url_decode(header_segment))
+        payload = json.loads(_b64url_decode(payload_segment))
+    except ValueError:
+        raise InvalidTokenError
+
+    if not isinstance(header, dict) or header.get("alg") != algorithm:
+        raise InvalidTokenError
+    if header.get("b64") is False:
+        # Unencoded (detached) payloads are never issued by this service.
+        raise InvalidTokenError
+    if not isinstance(payload, dict):
+        raise InvalidTokenError
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp < time.time():
+        raise TokenExpiredError
+
+
+async def _load_user(user_id: int, redis: Redis, db: AsyncSession) -> UserModel | None:
+    """Return the user attached to `db`, from the caches when possible."""
+    cached_user = _user_cache.get(user_id)
+    if cached_user is None:
+        values = await _get_shared_user(redis, user_id)
+        if values is None:
+            row = (await db.execute(_USER_COLUMNS_BY_ID, {"user_id": user_id})).first()
+            if row is None:
+                return None
+            values = row._asdict()
+            await _set_shared_user(redis, values)
+
+        cached_user = UserModel(**values)
+        make_transient_to_detached(cached_user)
+        set_committed_value(
+            cached_user, "group", await _get_group(db, cached_user.group_id)
+        )
+        _user_cache.set(user_id, cached_user)
+    return await db.merge(cached_user, load=False)
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    request: Request,
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+    settings: BaseAppSettings = Depends(get_app_settings),
     redis: Redis = Depends(get_redis),
     db: AsyncSession = Depends(get_db),
 ) -> UserModel:
     """Authenticate the request and return the current user from a JWT token."""
 
-    token = credentials.credentials if credentials else None
-    print("Token received:", token)
+    token = get_bearer_token(request)
     if not token:
-        print(
-            "JWT error:",
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("JWT error: missing bearer token")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token"
         )
 
-    if await is_token_revoked(token, redis):
+    if len(token) > JWTAuthManager.MAX_TOKEN_LENGTH:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token too large"
         )
 
-    try:
-        payload = jwt_manager.decode_access_token(token)
-    except TokenExpiredError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
-        )
-    except InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token validation failed"
-        ) from e
-    print("payload", payload)
+    # A cached payload belongs to a token that was verified and has not expired
+    # yet, so neither the peek nor the full decode (and their JSON parsing) is
+    # needed for it.
+    payload_key = token_cache_key(token)
+    payload = _verified_payloads.get(payload_key)
+
+    if payload is None:
+        try:
+            _peek_jwt(token, settings.JWT_SIGNING_ALGORITHM)
+        except TokenExpiredError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
+            )
+        except InvalidTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
+
+        try:
+            payload = jwt_manager.decode_access_token(token)
+        except TokenExpiredError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
+            )
+        except InvalidTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token validation failed",
+            ) from e
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            _verified_payloads.set(payload_key, payload, ttl=min(60, exp - time.time()))
 
     user_id = payload.get("user_id")
-    print("Decoded user_id:", user_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Decoded token payload %s for user_id %s", payload, user_id)
 
-    result = await db.execute(
-        select(UserModel)
-        .options(joinedload(UserModel.group))
-        .where(UserModel.id == user_id)
+    # The revocation check (Redis) and the user lookup (caches, then the
+    # database) are independent, so they wait on their sockets concurrently.
+    # A revoked token's user is simply discarded.
+    revoked, user = await asyncio.gather(
+        is_token_revoked(token, redis), _load_user(user_id, redis, db)
     )
-    user = result.scalars().first()
+    if revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+        )
     return user
@@ -1,11 +1,30 @@
 import os
+from functools import lru_cache
+
 from src.config.settings import TestingSettings, Settings, BaseAppSettings
 
+ENVIRONMENT = os.getenv("ENVIRONMENT", "developing")
+
 
+@lru_cache(maxsize=1)
 def get_settings() -> BaseAppSettings:
-    """Return application settings based on the current environment."""
+    """
+    Return application settings based on the current environment.
+
+    The settings object is built once per process and reused afterwards.
+    Call `get_settings.cache_clear()` to force a rebuild (e.g. in tests).
+    """
 
-    environment = os.getenv("ENVIRONMENT", "developing")
-    if environment == "testing":
+    if ENVIRONMENT == "testing":
         return TestingSettings()
     return Settings()
+
+
+async def get_app_settings() -> BaseAppSettings:
+    """
+    Return the application settings as a FastAPI dependency.
+
+    FastAPI runs plain `def` dependencies in its threadpool; this one is
+    async, so the cached settings are returned without a thread hop.
+    """
+    return get_settings()
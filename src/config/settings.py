@@ -1,7 +1,10 @@
 import os
+import secrets
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from dotenv import load_dotenv
@@ -45,7 +48,8 @@ class BaseAppSettings(BaseSettings):
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY")
     STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET")
 
-    @property
+    @computed_field
+    @cached_property
     def S3_STORAGE_ENDPOINT(self) -> str:
         return f"http://{self.S3_STORAGE_HOST}:{self.S3_STORAGE_PORT}"
 
@@ -53,6 +57,7 @@ class BaseAppSettings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
 
@@ -63,8 +68,10 @@ class Settings(BaseAppSettings):
     POSTGRES_DB_PORT: int = int(os.getenv("POSTGRES_DB_PORT", 5432))
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "test_db")
 
-    SECRET_KEY_ACCESS: str = os.getenv("SECRET_KEY_ACCESS", os.urandom(32))
-    SECRET_KEY_REFRESH: str = os.getenv("SECRET_KEY_REFRESH", os.urandom(32))
+    # Read from the environment by pydantic-settings; a random key is only
+    # generated when the variable is not set.
+    SECRET_KEY_ACCESS: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+    SECRET_KEY_REFRESH: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
     JWT_SIGNING_ALGORITHM: str = os.getenv("JWT_SIGNING_ALGORITHM", "HS256")
 
 
@@ -1,9 +1,11 @@
-import os
+import logging
+from src.config.get_settings import ENVIRONMENT
 from src.database.models.base import Base
 from src.database.models.accounts import (
     UserModel,
     UserGroupModel,
     UserGroupEnum,
+    USER_GROUP_MASKS,
     ActivationTokenModel,
     PasswordResetTokenModel,
     RefreshTokenModel,
@@ -35,28 +37,23 @@ from src.database.models.payments import (
     PaymentModel,
     PaymentStatusEnum,
 )
-from src.database.session_sqlite import reset_sqlite_database as reset_database
 
 from src.database.validators import accounts as accounts_validators
 from src.database.validators import profiles as profile_validators
-from dotenv import load_dotenv
 
 
-load_dotenv()
-environment = os.getenv("ENVIRONMENT", "developing")
-print(">>> DATABASE INIT, ENV =", os.getenv("ENVIRONMENT"))
+logging.getLogger(__name__).debug("Database init, ENV = %s", ENVIRONMENT)
 
-if environment == "testing":
+if ENVIRONMENT == "testing":
     from src.database.session_sqlite import (
         get_sqlite_db_contextmanager as get_db_contextmanager,
         get_sqlite_db as get_db,
+        reset_sqlite_database as reset_database,
     )
-
-    # from src.database.session_sqlite import reset_sqlite_database as reset_database
 else:
     from src.database.session_db import (
         get_db_contextmanager,
         get_db,
         AsyncSessionLocal,
-        sync_engine,
+        get_sync_engine,
     )
@@ -9,7 +9,7 @@ from alembic import context
 # from database.models import movies
 from src.database.models.base import Base
 from src.database.models import *
-from src.database import sync_engine
+from src.database import get_sync_engine
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -45,7 +45,7 @@ def run_migrations_offline() -> None:
 
     """
 
-    connectable = sync_engine
+    connectable = get_sync_engine()
 
     with connectable.connect() as connection:
         context.configure(
@@ -66,7 +66,7 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = sync_engine
+    connectable = get_sync_engine()
 
     with connectable.connect() as connection:
         context.configure(
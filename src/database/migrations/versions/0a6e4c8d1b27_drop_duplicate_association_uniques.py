@@ -0,0 +1,50 @@
+"""drop duplicate association uniques
+
+Revision ID: 0a6e4c8d1b27
+Revises: f18c6d2a9e53
+Create Date: 2026-01-19 12:48:03.661590
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6e4c8d1b27"
+down_revision: Union[str, Sequence[str], None] = "f18c6d2a9e53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Unique constraints that duplicated the composite primary keys. Both the
+# initial schema and cef697126140 created one per table, so PostgreSQL has
+# them as {table}_{columns}_key and {table}_{columns}_key1.
+CONSTRAINTS = [
+    ("user_favorite_movies", ["user_id", "movie_id"]),
+    ("movie_likes", ["user_id", "movie_id"]),
+    ("comment_likes", ["user_id", "comment_id"]),
+]
+DUPLICATES = 2
+
+
+def _names(table: str, columns: list[str]) -> list[str]:
+    base = f"{table}_{'_'.join(columns)}_key"
+    return [base] + [f"{base}{i}" for i in range(1, DUPLICATES)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in CONSTRAINTS:
+        for constraint in inspector.get_unique_constraints(table):
+            if constraint["name"] and set(constraint["column_names"]) == set(columns):
+                op.drop_constraint(constraint["name"], table, type_="unique")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in CONSTRAINTS:
+        for name in _names(table, columns):
+            op.create_unique_constraint(name, table, columns)
@@ -0,0 +1,47 @@
+"""movie real columns
+
+Revision ID: 1d9b7f3e6c45
+Revises: 0a6e4c8d1b27
+Create Date: 2026-01-20 09:31:16.904352
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1d9b7f3e6c45"
+down_revision: Union[str, Sequence[str], None] = "0a6e4c8d1b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {"meta_score": True, "gross": True, "rating_average": False}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column, nullable in COLUMNS.items():
+        op.alter_column(
+            "movies",
+            column,
+            existing_type=sa.Float(),
+            type_=sa.Float(precision=24),
+            postgresql_using=f"{column}::real",
+            existing_nullable=nullable,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column, nullable in COLUMNS.items():
+        op.alter_column(
+            "movies",
+            column,
+            existing_type=sa.Float(precision=24),
+            type_=sa.Float(),
+            postgresql_using=f"{column}::double precision",
+            existing_nullable=nullable,
+        )
@@ -0,0 +1,41 @@
+"""movie rating average default
+
+Revision ID: 2c8a0e5f7d13
+Revises: 1d9b7f3e6c45
+Create Date: 2026-01-21 15:20:47.118593
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c8a0e5f7d13"
+down_revision: Union[str, Sequence[str], None] = "1d9b7f3e6c45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "movies",
+        "rating_average",
+        existing_type=sa.Float(precision=24),
+        server_default="0",
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "movies",
+        "rating_average",
+        existing_type=sa.Float(precision=24),
+        server_default=None,
+        existing_nullable=False,
+    )
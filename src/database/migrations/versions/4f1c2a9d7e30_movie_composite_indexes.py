@@ -0,0 +1,51 @@
+"""movie composite indexes
+
+Revision ID: 4f1c2a9d7e30
+Revises: cef697126140
+Create Date: 2026-01-12 10:41:08.512337
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1c2a9d7e30"
+down_revision: Union[str, Sequence[str], None] = "cef697126140"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_movies_cert_year_imdb",
+        "movies",
+        ["certification_id", "year"],
+        unique=False,
+        postgresql_include=["imdb", "name", "price"],
+    )
+    op.create_index(
+        "idx_movies_year_imdb_desc",
+        "movies",
+        ["year", sa.text("imdb DESC")],
+        unique=False,
+    )
+    op.drop_index("idx_movies_year", table_name="movies")
+    op.create_index(
+        "idx_ratings_movie_created",
+        "movie_ratings",
+        ["movie_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_ratings_movie_created", table_name="movie_ratings")
+    op.create_index("idx_movies_year", "movies", ["year"], unique=False)
+    op.drop_index("idx_movies_year_imdb_desc", table_name="movies")
+    op.drop_index("idx_movies_cert_year_imdb", table_name="movies")
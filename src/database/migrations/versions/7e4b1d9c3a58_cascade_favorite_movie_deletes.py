@@ -0,0 +1,41 @@
+"""cascade favorite movie deletes
+
+Revision ID: 7e4b1d9c3a58
+Revises: 2c8a0e5f7d13
+Create Date: 2026-01-22 10:14:38.275019
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7e4b1d9c3a58"
+down_revision: Union[str, Sequence[str], None] = "2c8a0e5f7d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "user_favorite_movies_movie_id_fkey"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint(CONSTRAINT, "user_favorite_movies", type_="foreignkey")
+    op.create_foreign_key(
+        CONSTRAINT,
+        "user_favorite_movies",
+        "movies",
+        ["movie_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(CONSTRAINT, "user_favorite_movies", type_="foreignkey")
+    op.create_foreign_key(
+        CONSTRAINT, "user_favorite_movies", "movies", ["movie_id"], ["id"]
+    )
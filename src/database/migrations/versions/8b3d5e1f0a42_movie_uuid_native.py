@@ -0,0 +1,45 @@
+"""movie uuid native
+
+Revision ID: 8b3d5e1f0a42
+Revises: 4f1c2a9d7e30
+Create Date: 2026-01-14 09:12:44.170925
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3d5e1f0a42"
+down_revision: Union[str, Sequence[str], None] = "4f1c2a9d7e30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "movies",
+        "uuid",
+        existing_type=sa.String(length=36),
+        type_=sa.Uuid(),
+        postgresql_using="uuid::uuid",
+        server_default=sa.text("gen_random_uuid()"),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "movies",
+        "uuid",
+        existing_type=sa.Uuid(),
+        type_=sa.String(length=36),
+        postgresql_using="uuid::text",
+        server_default=None,
+        existing_nullable=False,
+    )
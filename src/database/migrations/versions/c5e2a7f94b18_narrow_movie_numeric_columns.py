@@ -0,0 +1,77 @@
+"""narrow movie numeric columns
+
+Revision ID: c5e2a7f94b18
+Revises: 8b3d5e1f0a42
+Create Date: 2026-01-15 16:03:27.541208
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e2a7f94b18"
+down_revision: Union[str, Sequence[str], None] = "8b3d5e1f0a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ("year", "time"):
+        op.alter_column(
+            "movies",
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            postgresql_using=f"{column}::smallint",
+            existing_nullable=False,
+        )
+    op.alter_column(
+        "movies",
+        "imdb",
+        existing_type=sa.Float(),
+        type_=sa.Numeric(3, 1),
+        postgresql_using="round(imdb::numeric, 1)",
+        existing_nullable=False,
+    )
+    op.alter_column(
+        "movie_ratings",
+        "rating",
+        existing_type=sa.Integer(),
+        type_=sa.SmallInteger(),
+        postgresql_using="rating::smallint",
+        existing_nullable=False,
+        existing_server_default=sa.text("0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "movie_ratings",
+        "rating",
+        existing_type=sa.SmallInteger(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+        existing_server_default=sa.text("0"),
+    )
+    op.alter_column(
+        "movies",
+        "imdb",
+        existing_type=sa.Numeric(3, 1),
+        type_=sa.Float(),
+        postgresql_using="imdb::double precision",
+        existing_nullable=False,
+    )
+    for column in ("year", "time"):
+        op.alter_column(
+            "movies",
+            column,
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,71 @@
+"""partition movie ratings
+
+Revision ID: d71f0c3b5a96
+Revises: c5e2a7f94b18
+Create Date: 2026-01-16 11:27:50.803114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d71f0c3b5a96"
+down_revision: Union[str, Sequence[str], None] = "c5e2a7f94b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+
+def _create_ratings_table(**kw) -> None:
+    op.create_table(
+        "movie_ratings",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("rating", sa.SmallInteger(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "movie_id"),
+        **kw,
+    )
+    op.create_index(
+        "idx_ratings_movie_created",
+        "movie_ratings",
+        ["movie_id", "created_at"],
+        unique=False,
+    )
+
+
+def _swap_ratings_table(**kw) -> None:
+    op.drop_index("idx_ratings_movie_created", table_name="movie_ratings")
+    op.rename_table("movie_ratings", "movie_ratings_old")
+    op.execute(
+        "ALTER TABLE movie_ratings_old "
+        "RENAME CONSTRAINT movie_ratings_pkey TO movie_ratings_old_pkey"
+    )
+    _create_ratings_table(**kw)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _swap_ratings_table(postgresql_partition_by="HASH (movie_id)")
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE movie_ratings_p{remainder} PARTITION OF movie_ratings "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute("INSERT INTO movie_ratings SELECT * FROM movie_ratings_old")
+    op.drop_table("movie_ratings_old")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap_ratings_table()
+    op.execute("INSERT INTO movie_ratings SELECT * FROM movie_ratings_old")
+    op.drop_table("movie_ratings_old")
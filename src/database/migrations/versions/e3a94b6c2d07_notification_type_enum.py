@@ -0,0 +1,55 @@
+"""notification type enum
+
+Revision ID: e3a94b6c2d07
+Revises: d71f0c3b5a96
+Create Date: 2026-01-17 14:55:12.396481
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a94b6c2d07"
+down_revision: Union[str, Sequence[str], None] = "d71f0c3b5a96"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+notification_type = sa.Enum("COMMENT_REPLY", "COMMENT_LIKE", name="notification_type")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    notification_type.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        "notifications",
+        "type",
+        existing_type=sa.String(length=50),
+        type_=notification_type,
+        postgresql_using="upper(type)::notification_type",
+        existing_nullable=False,
+    )
+    op.create_index(
+        "idx_notifs_user_unread",
+        "notifications",
+        ["user_id", sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("NOT read"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_notifs_user_unread", table_name="notifications")
+    op.alter_column(
+        "notifications",
+        "type",
+        existing_type=notification_type,
+        type_=sa.String(length=50),
+        postgresql_using="lower(type::text)",
+        existing_nullable=False,
+    )
+    notification_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,39 @@
+"""comment indexes
+
+Revision ID: f18c6d2a9e53
+Revises: e3a94b6c2d07
+Create Date: 2026-01-18 10:06:39.218764
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f18c6d2a9e53"
+down_revision: Union[str, Sequence[str], None] = "e3a94b6c2d07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_comments_top_level",
+        "movie_comments",
+        ["movie_id", sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("parent_id IS NULL"),
+    )
+    op.create_index(
+        "idx_comments_parent", "movie_comments", ["parent_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_comments_parent", table_name="movie_comments")
+    op.drop_index("idx_comments_top_level", table_name="movie_comments")
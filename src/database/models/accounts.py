@@ -21,7 +21,11 @@ from src.database import Base
 # from src.database.models.movies.movies_base import MovieModel
 # from src.database.models.movies.movies_actions import UserFavoriteMovieModel
 from src.database.validators import accounts as validators
-from src.security.passwords import hash_password, verify_password
+from src.security.passwords import (
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 from src.security.utils import generate_secure_token
 
 
@@ -31,6 +35,12 @@ class UserGroupEnum(str, enum.Enum):
     ADMIN = "admin"
 
 
+# One bit per group, so role checks are a single integer AND.
+USER_GROUP_MASKS: dict[UserGroupEnum, int] = {
+    group: 1 << index for index, group in enumerate(UserGroupEnum)
+}
+
+
 class GenderEnum(str, enum.Enum):
     MAN = "man"
     WOMAN = "woman"
@@ -141,8 +151,15 @@ class UserModel(Base):
             f"<UserModel(id={self.id}, email={self.email}, is_active={self.is_active})>"
         )
 
-    def has_group(self, group_name: UserGroupEnum) -> bool:
-        return self.group.name == group_name
+    def has_group(self, *group_names: UserGroupEnum) -> bool:
+        wanted = 0
+        for group_name in group_names:
+            wanted |= USER_GROUP_MASKS[group_name]
+        return bool(self.role_mask & wanted)
+
+    @property
+    def role_mask(self) -> int:
+        return USER_GROUP_MASKS[self.group.name]
 
     @property
     def group_name(self) -> str:
@@ -181,8 +198,15 @@ class UserModel(Base):
         """
         Set the user's password after validating its strength and hashing it.
         """
+        self._hashed_password = self.hash_new_password(raw_password)
+
+    @staticmethod
+    def hash_new_password(raw_password: str) -> str:
+        """
+        Validate the strength of a new password and return its hash.
+        """
         validators.validate_password_strength(raw_password)
-        self._hashed_password = hash_password(raw_password)
+        return hash_password(raw_password)
 
     def verify_password(self, raw_password: str) -> bool:
         """
@@ -190,6 +214,12 @@ class UserModel(Base):
         """
         return verify_password(raw_password, self._hashed_password)
 
+    def password_needs_rehash(self) -> bool:
+        """
+        Tell whether the stored hash uses a deprecated scheme (bcrypt).
+        """
+        return password_needs_rehash(self._hashed_password)
+
     @validates("email")
     def validate_email(self, key, value: str) -> str:
         return validators.validate_email(value.lower())
@@ -241,8 +271,9 @@ class TokenBaseModel(Base):
 class ActivationTokenModel(TokenBaseModel):
     __tablename__ = "activation_tokens"
 
+    # The user is needed whenever a token is looked up (activation).
     user: Mapped[UserModel] = relationship(
-        "UserModel", back_populates="activation_tokens"
+        "UserModel", back_populates="activation_tokens", lazy="joined"
     )
 
     __table_args__ = (UniqueConstraint("user_id"),)
@@ -1,5 +1,31 @@
+from sqlalchemy import Uuid
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.functions import FunctionElement
 
 
 class Base(DeclarativeBase):
     pass
+
+
+class gen_random_uuid(FunctionElement):
+    """
+    Server-side random UUID, usable as a column `server_default`.
+
+    PostgreSQL (13+) provides `gen_random_uuid()` natively; SQLite, used by the
+    test suite, gets an equivalent 32-hex-digit value matching how `Uuid`
+    stores UUIDs there.
+    """
+
+    type = Uuid()
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid, "postgresql")
+def _pg_gen_random_uuid(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid)
+def _default_gen_random_uuid(element, compiler, **kw):
+    return "(lower(hex(randomblob(16))))"
@@ -1,9 +1,11 @@
+from enum import Enum
 from typing import Optional
 from datetime import datetime
 
 from sqlalchemy import (
     String,
     Integer,
+    SmallInteger,
     Boolean,
     Float,
     Text,
@@ -15,6 +17,10 @@ from sqlalchemy import (
     Column,
     Index,
     func,
+    DDL,
+    Enum as SQLEnum,
+    event,
+    text,
 )
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
@@ -31,7 +37,7 @@ class MovieRatingModel(Base):
         ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True
     )
     rating: Mapped[int] = mapped_column(
-        Integer, nullable=False, default=0, server_default="0"
+        SmallInteger, nullable=False, default=0, server_default="0"
     )  # 1–10
     created_at: Mapped[datetime] = mapped_column(default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -40,6 +46,26 @@ class MovieRatingModel(Base):
     user: Mapped["UserModel"] = relationship("UserModel", back_populates="rated_movies")
     movie: Mapped["MovieModel"] = relationship("MovieModel", back_populates="ratings")
 
+    __table_args__ = (
+        Index("idx_ratings_movie_created", "movie_id", "created_at"),
+        {"postgresql_partition_by": "HASH (movie_id)"},
+    )
+
+
+RATING_PARTITIONS = 16
+
+# A hash-partitioned parent table holds no rows itself; its partitions are
+# created right after it (PostgreSQL only).
+for _remainder in range(RATING_PARTITIONS):
+    event.listen(
+        MovieRatingModel.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE movie_ratings_p{_remainder} PARTITION OF movie_ratings "
+            f"FOR VALUES WITH (MODULUS {RATING_PARTITIONS}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
+
 
 class MovieCommentModel(Base):
     __tablename__ = "movie_comments"
@@ -72,23 +98,50 @@ class MovieCommentModel(Base):
         lazy="joined",
     )
 
+    __table_args__ = (
+        Index(
+            "idx_comments_top_level",
+            "movie_id",
+            text("created_at DESC"),
+            postgresql_where=text("parent_id IS NULL"),
+            sqlite_where=text("parent_id IS NULL"),
+        ),
+        Index("idx_comments_parent", "parent_id"),
+    )
+
+
+class NotificationTypeEnum(str, Enum):
+    COMMENT_REPLY = "comment_reply"
+    COMMENT_LIKE = "comment_like"
+
 
 class NotificationModel(Base):
     __tablename__ = "notifications"
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    type: Mapped[str] = mapped_column(String(50))  # comment_reply, comment_like
+    type: Mapped[NotificationTypeEnum] = mapped_column(
+        SQLEnum(NotificationTypeEnum, name="notification_type")
+    )
     related_id: Mapped[int]  # comment_id or like_id
     read: Mapped[bool] = mapped_column(default=False)
     created_at: Mapped[datetime] = mapped_column(default=func.now())
 
+    __table_args__ = (
+        Index(
+            "idx_notifs_user_unread",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("NOT read"),
+            sqlite_where=text("NOT read"),
+        ),
+    )
+
 
 UserFavoriteMovieModel = Table(
     "user_favorite_movies",
     Base.metadata,
     Column("user_id", ForeignKey("users.id"), primary_key=True),
-    Column("movie_id", ForeignKey("movies.id"), primary_key=True),
-    UniqueConstraint("user_id", "movie_id"),
+    Column("movie_id", ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
 )
 
 CommentLikeModel = Table(
@@ -100,7 +153,6 @@ CommentLikeModel = Table(
         ForeignKey("movie_comments.id", ondelete="CASCADE"),
         primary_key=True,
     ),
-    UniqueConstraint("user_id", "comment_id"),
 )
 
 MovieLikeModel = Table(
@@ -109,5 +161,4 @@ MovieLikeModel = Table(
     Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
     Column("movie_id", ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("like", Boolean, nullable=False, default=True),
-    UniqueConstraint("user_id", "movie_id"),
 )
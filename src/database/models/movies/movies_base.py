@@ -8,6 +8,8 @@ from datetime import datetime
 from sqlalchemy import (
     String,
     Integer,
+    SmallInteger,
+    Numeric,
     Float,
     Text,
     DECIMAL,
@@ -21,11 +23,13 @@ from sqlalchemy import (
     select,
     and_,
     column,
+    Uuid,
 )
 from sqlalchemy.orm import mapped_column, Mapped, relationship, column_property
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import text
 from src.database import Base
+from src.database.models.base import gen_random_uuid
 
 
 MovieGenreModel = Table(
@@ -142,7 +146,10 @@ class CertificationModel(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
 
     movies: Mapped[list["MovieModel"]] = relationship(
-        "MovieModel", back_populates="certification", cascade="all, delete-orphan"
+        "MovieModel",
+        back_populates="certification",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -153,16 +160,20 @@ class MovieModel(Base):
     __tablename__ = "movies"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    uuid: Mapped[str] = mapped_column(
-        String(36), default=lambda: str(uuid_lib.uuid4()), unique=True, nullable=False
+    uuid: Mapped[uuid_lib.UUID] = mapped_column(
+        Uuid, server_default=gen_random_uuid(), unique=True, nullable=False
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    year: Mapped[int] = mapped_column(Integer, nullable=False)
-    time: Mapped[int] = mapped_column(Integer, nullable=False)  # duration in minutes
-    imdb: Mapped[float] = mapped_column(Float, nullable=False)
+    year: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    time: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False
+    )  # duration in minutes
+    imdb: Mapped[float] = mapped_column(Numeric(3, 1, asdecimal=False), nullable=False)
     votes: Mapped[int] = mapped_column(Integer, nullable=False)
-    meta_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    gross: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    meta_score: Mapped[Optional[float]] = mapped_column(
+        Float(precision=24), nullable=True
+    )
+    gross: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
 
@@ -170,41 +181,63 @@ class MovieModel(Base):
         ForeignKey("certifications.id", ondelete="CASCADE"), nullable=False
     )
 
+    # Relationships never load implicitly; queries that need them opt in with
+    # selectinload()/joinedload(). Link rows of a deleted movie are removed by
+    # the ON DELETE CASCADE foreign keys, not by loading the collections.
     certification: Mapped["CertificationModel"] = relationship(
-        "CertificationModel", back_populates="movies"
+        "CertificationModel", back_populates="movies", lazy="raise_on_sql"
     )
 
     genres: Mapped[list["GenreModel"]] = relationship(
-        "GenreModel", secondary=MovieGenreModel, back_populates="movies"
+        "GenreModel",
+        secondary=MovieGenreModel,
+        back_populates="movies",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     stars: Mapped[list["StarModel"]] = relationship(
-        "StarModel", secondary=MovieStarModel, back_populates="movies"
+        "StarModel",
+        secondary=MovieStarModel,
+        back_populates="movies",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     directors: Mapped[list["DirectorModel"]] = relationship(
-        "DirectorModel", secondary=MovieDirectorModel, back_populates="movies"
+        "DirectorModel",
+        secondary=MovieDirectorModel,
+        back_populates="movies",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     favorited_by_users: Mapped[list["UserModel"]] = relationship(
         "UserModel",
         secondary="user_favorite_movies",
         back_populates="favorite_movies",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     liked_by_users: Mapped[list["UserModel"]] = relationship(
         "UserModel",
         secondary="movie_likes",
         back_populates="liked_movies",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     ratings: Mapped[list["MovieRatingModel"]] = relationship(
         "MovieRatingModel",
         back_populates="movie",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
+    rating_average: Mapped[float] = mapped_column(
+        Float(precision=24), default=0.0, server_default="0"
     )
-    rating_average: Mapped[float] = mapped_column(Float, default=0.0)
     rating_count: Mapped[int] = mapped_column(
         Integer, default=0, server_default="0", index=True
     )
@@ -226,7 +259,16 @@ class MovieModel(Base):
             postgresql_using="gin",
             postgresql_ops={"lower(name)": "gin_trgm_ops"},
         ),
-        Index("idx_movies_year", "year"),
+        # Equality on certification, range on year; the included columns let
+        # list pages be served from the index alone.
+        Index(
+            "idx_movies_cert_year_imdb",
+            "certification_id",
+            "year",
+            postgresql_include=["imdb", "name", "price"],
+        ),
+        # Year range filters sorted by rating; also covers year-only filters.
+        Index("idx_movies_year_imdb_desc", "year", text("imdb DESC")),
         Index("idx_movies_imdb", "imdb"),
         Index("idx_movies_price", "price"),
     )
@@ -4,7 +4,9 @@ from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from faker import Faker
-from sqlalchemy import select, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import Index, Table, select, func, insert, literal, text, union_all
 
 from src.database import (
     MovieModel,
@@ -12,6 +14,9 @@ from src.database import (
     StarModel,
     DirectorModel,
     CertificationModel,
+    MovieGenreModel,
+    MovieStarModel,
+    MovieDirectorModel,
     UserGroupModel,
     UserGroupEnum,
     UserModel,
@@ -19,10 +24,7 @@ from src.database import (
     OrderModel,
     OrderItemModel,
 )
-
-import os
-
-ENV = os.getenv("ENVIRONMENT", "developing")
+from src.config.get_settings import ENVIRONMENT as ENV
 
 
 if ENV == "testing":
@@ -43,25 +45,255 @@ else:
 fake = Faker()
 
 NUM_MOVIES = 500  # number of movies to add
+# Above this many movies, PostgreSQL secondary indexes on `movies` are dropped
+# for the load and built once afterwards (and, in development, the link tables
+# are loaded UNLOGGED). Kept below NUM_MOVIES so every default seed takes this
+# path; the small test seeds do not.
+INDEX_REBUILD_THRESHOLD = 200
+# Movies generated and loaded per batch.
+SEED_CHUNK_SIZE = 1000
+# Distinct shuffles of a reference pool that link samples are drawn from.
+LINK_SHUFFLES = 256
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+async def _copy_records(
+    session: AsyncSession, table_name: str, columns: list[str], records: list[tuple]
+) -> None:
+    """
+    Stream rows into a table with PostgreSQL COPY, inside the session's transaction.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table_name, records=records, columns=columns
+    )
+
+
+async def _insert_movies(session: AsyncSession, movie_rows: list[dict]) -> list[int]:
+    """
+    Bulk insert movie rows and return their ids in the order of `movie_rows`.
+
+    PostgreSQL gets COPY; COPY cannot return generated keys, so the ids are
+    assigned before the load. Columns left out (`uuid`, the counters) take
+    their server defaults.
+    Other dialects use a single executemany INSERT ... RETURNING.
+    """
+    if not _is_postgres(session):
+        result = await session.execute(
+            insert(MovieModel).returning(MovieModel.id, sort_by_parameter_order=True),
+            movie_rows,
+        )
+        return result.scalars().all()
+
+    result = await session.execute(
+        text(
+            "SELECT nextval(pg_get_serial_sequence('movies', 'id')) "
+            "FROM generate_series(1, :count)"
+        ),
+        {"count": len(movie_rows)},
+    )
+    movie_ids = result.scalars().all()
+
+    columns = ["id", *movie_rows[0]]
+    records = [
+        (
+            movie_id,
+            *(
+                Decimal(str(value)) if column in ("price", "imdb") else value
+                for column, value in row.items()
+            ),
+        )
+        for movie_id, row in zip(movie_ids, movie_rows)
+    ]
+    await _copy_records(session, MovieModel.__tablename__, columns, records)
+    return movie_ids
+
+
+def _secondary_movie_indexes() -> list[Index]:
+    return [index for index in MovieModel.__table__.indexes if not index.unique]
+
+
+async def _drop_movie_indexes(session: AsyncSession) -> None:
+    connection = await session.connection()
+    for index in _secondary_movie_indexes():
+        await connection.run_sync(index.drop, checkfirst=True)
+
+
+async def _create_movie_indexes(session: AsyncSession) -> None:
+    connection = await session.connection()
+    for index in _secondary_movie_indexes():
+        await connection.run_sync(index.create, checkfirst=True)
+
+
+MOVIE_LINK_TABLES = (MovieGenreModel, MovieStarModel, MovieDirectorModel)
+
+
+async def _set_links_logged(session: AsyncSession, logged: bool) -> None:
+    """
+    Switch the movie link tables between LOGGED and UNLOGGED (dev seeding only).
+
+    `movies` itself stays logged: PostgreSQL does not allow a logged table
+    (carts, orders, ...) to reference an unlogged one.
+    """
+    mode = "LOGGED" if logged else "UNLOGGED"
+    for table in MOVIE_LINK_TABLES:
+        await session.execute(text(f"ALTER TABLE {table.name} SET {mode}"))
+
+
+async def _insert_links(session: AsyncSession, table: Table, rows: list[dict]) -> None:
+    if not rows:
+        return
+    if _is_postgres(session):
+        columns = list(rows[0])
+        records = [tuple(row.values()) for row in rows]
+        await _copy_records(session, table.name, columns, records)
+    else:
+        await session.execute(insert(table), rows)
+
+
+def _new_names(existing: set[str], count: int) -> list[str]:
+    """
+    Draw `count` distinct person names that are not in `existing`.
+    """
+    names = {fake.name() for _ in range(count * 2)} - existing
+    while len(names) < count:
+        names |= {fake.name() for _ in range(count)} - existing
+    return list(names)[:count]
+
+
+async def _insert_named(session: AsyncSession, model, names: list[str]) -> list[int]:
+    """
+    Insert one row per name into `model` and return the new ids.
+    """
+    result = await session.execute(
+        insert(model).returning(model.id), [{"name": name} for name in names]
+    )
+    return result.scalars().all()
+
+
+def _movie_rows(
+    rng: random.Random,
+    count: int,
+    certification_ids: list[int],
+    descriptions: list[str],
+) -> list[dict]:
+    """
+    Build `count` random movie rows.
+
+    Columns are drawn whole with one call each instead of several random/Faker
+    calls per row. Decimal columns are sampled on their rounding grid, and
+    text comes from one word batch and a small pool of descriptions.
+    """
+    names = [
+        " ".join(words).title() for words in zip(*[iter(fake.words(nb=3 * count))] * 3)
+    ]
+    columns = zip(
+        names,
+        rng.choices(range(1980, 2026), k=count),
+        rng.choices(range(80, 181), k=count),
+        rng.choices(range(50, 99), k=count),
+        rng.choices(range(10_000, 2_000_001), k=count),
+        rng.choices(range(500, 1001), k=count),
+        rng.choices(range(1_000_000_000, 90_000_000_001), k=count),
+        rng.choices(descriptions, k=count),
+        rng.choices(range(399, 2000), k=count),
+        rng.choices(certification_ids, k=count),
+    )
+    return [
+        {
+            "name": name,
+            "year": year,
+            "time": time,
+            "imdb": imdb / 10,
+            "votes": votes,
+            "meta_score": meta_score / 10,
+            "gross": gross / 100,
+            "description": description,
+            "price": price / 100,
+            "certification_id": certification_id,
+        }
+        for (
+            name,
+            year,
+            time,
+            imdb,
+            votes,
+            meta_score,
+            gross,
+            description,
+            price,
+            certification_id,
+        ) in columns
+    ]
+
+
+def _sample_links(
+    rng: random.Random,
+    movie_ids: list[int],
+    column: str,
+    pool: list[int],
+    low: int,
+    high: int,
+) -> list[dict]:
+    """
+    Link every movie to between `low` and `high` distinct ids from `pool`.
+
+    Each movie takes the prefix of a shuffled copy of `pool` drawn from a small
+    set of shuffles, so no per-movie sampling is needed.
+    """
+    counts = rng.choices(range(low, high + 1), k=len(movie_ids))
+    shuffles = [
+        rng.sample(pool, len(pool)) for _ in range(min(len(movie_ids), LINK_SHUFFLES))
+    ]
+    picks = rng.choices(shuffles, k=len(movie_ids))
+    return [
+        {"movie_id": movie_id, column: ref_id}
+        for movie_id, shuffled, count in zip(movie_ids, picks, counts)
+        for ref_id in shuffled[:count]
+    ]
 
 
 async def seed_movies(session: AsyncSession, num_movies: int = NUM_MOVIES) -> None:
-    certifications = (await session.execute(select(CertificationModel))).scalars().all()
-    genres = (await session.execute(select(GenreModel))).scalars().all()
-    stars = (await session.execute(select(StarModel))).scalars().all()
-    directors = (await session.execute(select(DirectorModel))).scalars().all()
-
-    if not certifications:
-        certifications = [
-            CertificationModel(name=name) for name in ["G", "PG", "PG-13", "R", "NC-17"]
-        ]
-        session.add_all(certifications)
-        await session.flush()
-
-    if not genres:
-        genres = [
-            GenreModel(name=name)
-            for name in [
+    # Only ids (and names, for de-duplication) are needed, so no entities
+    # are loaded, and all four reference tables are read in one round trip.
+    reference_models = {
+        "certification": CertificationModel,
+        "genre": GenreModel,
+        "star": StarModel,
+        "director": DirectorModel,
+    }
+    # Streamed, so only the ids and names kept below are held in memory.
+    reference_rows = await session.stream(
+        union_all(
+            *(
+                select(literal(kind).label("kind"), model.id, model.name)
+                for kind, model in reference_models.items()
+            )
+        )
+    )
+    existing = {kind: [] for kind in reference_models}
+    async for kind, ref_id, name in reference_rows:
+        existing[kind].append((ref_id, name))
+
+    certification_ids = [ref_id for ref_id, _ in existing["certification"]]
+    genre_ids = [ref_id for ref_id, _ in existing["genre"]]
+    stars = existing["star"]
+    directors = existing["director"]
+
+    if not certification_ids:
+        certification_ids = await _insert_named(
+            session, CertificationModel, ["G", "PG", "PG-13", "R", "NC-17"]
+        )
+
+    if not genre_ids:
+        genre_ids = await _insert_named(
+            session,
+            GenreModel,
+            [
                 "Action",
                 "Adventure",
                 "Comedy",
@@ -72,82 +304,88 @@ async def seed_movies(session: AsyncSession, num_movies: int = NUM_MOVIES) -> No
                 "Thriller",
                 "Fantasy",
                 "Animation",
-            ]
-        ]
-        session.add_all(genres)
-        await session.flush()
-
-    existing_star_names = {s.name for s in stars}
-    new_stars = []
-    while len(new_stars) < 20:
-        name = fake.unique.name()
-        if name not in existing_star_names:
-            new_stars.append(StarModel(name=name))
-            existing_star_names.add(name)
-    session.add_all(new_stars)
-    await session.flush()
-    stars.extend(new_stars)
-
-    existing_director_names = {d.name for d in directors}
-    new_directors = []
-    while len(new_directors) < 10:
-        name = fake.unique.name()
-        if name not in existing_director_names:
-            new_directors.append(DirectorModel(name=name))
-            existing_director_names.add(name)
-    session.add_all(new_directors)
-    await session.flush()
-    directors.extend(new_directors)
+            ],
+        )
+
+    star_ids = [star_id for star_id, _ in stars]
+    star_ids += await _insert_named(
+        session, StarModel, _new_names({name for _, name in stars}, 20)
+    )
+    director_ids = [director_id for director_id, _ in directors]
+    director_ids += await _insert_named(
+        session, DirectorModel, _new_names({name for _, name in directors}, 10)
+    )
 
     # --- Create new movies ---
-    movies = []
-    for _ in range(num_movies):
-        certification = random.choice(certifications)
-        movie_genres = random.sample(genres, k=random.randint(1, 3))
-        movie_stars = random.sample(stars, k=random.randint(2, 5))
-        movie_directors = random.sample(directors, k=random.randint(1, 2))
-
-        movie = MovieModel(
-            name=fake.sentence(nb_words=3).rstrip("."),
-            year=random.randint(1980, 2025),
-            time=random.randint(80, 180),
-            imdb=round(random.uniform(5.0, 9.8), 1),
-            votes=random.randint(10_000, 2_000_000),
-            meta_score=round(random.uniform(50, 100), 1),
-            gross=round(random.uniform(10_000_000, 900_000_000), 2),
-            description=fake.paragraph(nb_sentences=3),
-            price=round(random.uniform(3.99, 19.99), 2),
-            certification=certification,
-            genres=movie_genres,
-            stars=movie_stars,
-            directors=movie_directors,
+    # Plain rows bulk-loaded in a few statements instead of per-object
+    # unit-of-work flushing.
+    if num_movies <= 0:
+        return
+
+    rng = random.Random()
+    descriptions = [fake.paragraph(nb_sentences=3) for _ in range(min(num_movies, 100))]
+
+    rebuild_indexes = _is_postgres(session) and num_movies > INDEX_REBUILD_THRESHOLD
+    if rebuild_indexes:
+        # Seeding is re-runnable from scratch, so durability of this one
+        # transaction can be traded for speed.
+        await session.execute(text("SET LOCAL synchronous_commit = off"))
+        await _drop_movie_indexes(session)
+    unlogged_links = rebuild_indexes and ENV == "developing"
+    if unlogged_links:
+        await _set_links_logged(session, False)
+
+    # Rows are built and loaded one chunk at a time, so memory stays bounded
+    # by the chunk size rather than by `num_movies`.
+    added = 0
+    for start in range(0, num_movies, SEED_CHUNK_SIZE):
+        count = min(SEED_CHUNK_SIZE, num_movies - start)
+        movie_rows = _movie_rows(rng, count, certification_ids, descriptions)
+        movie_ids = await _insert_movies(session, movie_rows)
+
+        await _insert_links(
+            session,
+            MovieGenreModel,
+            _sample_links(rng, movie_ids, "genre_id", genre_ids, 1, 3),
         )
+        await _insert_links(
+            session,
+            MovieStarModel,
+            _sample_links(rng, movie_ids, "star_id", star_ids, 2, 5),
+        )
+        await _insert_links(
+            session,
+            MovieDirectorModel,
+            _sample_links(rng, movie_ids, "director_id", director_ids, 1, 2),
+        )
+        added += len(movie_ids)
 
-        movies.append(movie)
-
-    session.add_all(movies)
+    if unlogged_links:
+        await _set_links_logged(session, True)
+    if rebuild_indexes:
+        await _create_movie_indexes(session)
 
-    print(f"✅ Added {len(movies)} new movies successfully!")
+    print(f"✅ Added {added} new movies successfully!")
 
 
 async def seed_user_groups(session: AsyncSession) -> None:
     """
-    Seed the UserGroupModel table with default user groups if none exist.
+    Seed the UserGroupModel table with the default user groups.
 
-    This method checks whether any user groups are already present in the database.
-    If no records are found, it inserts all groups defined in the UserGroupEnum.
-    After insertion, the changes are flushed to the current transaction.
+    Every group defined in the UserGroupEnum is inserted in the current
+    transaction with a single statement; groups that already exist are
+    skipped by the database (ON CONFLICT (name) DO NOTHING).
     """
 
-    count_stmt = select(func.count(UserGroupModel.id))
-    result = await session.execute(count_stmt)
-    existing_groups = result.scalar()
-
-    if existing_groups == 0:
-        groups = [{"name": group.value} for group in UserGroupEnum]
-        await session.execute(insert(UserGroupModel).values(groups))
-        await session.flush()
+    groups = [{"name": group.value} for group in UserGroupEnum]
+    insert_groups = pg_insert if _is_postgres(session) else sqlite_insert
+    result = await session.execute(
+        insert_groups(UserGroupModel.__table__)
+        .values(groups)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
 
+    if result.rowcount:
         print("✅ User groups seeded successfully.")
 
 
@@ -164,31 +402,32 @@ async def seed_users(session: AsyncSession) -> None:
     if len(group_map) < 3:
         raise RuntimeError("User groups not seeded properly!")
 
-    existing_emails = set(
-        (await session.execute(select(UserModel.email))).scalars().all()
-    )
-
     users = [
-        UserModel.create(
-            email="admin@test.com",
-            raw_password="Password1!",
-            group_id=group_map["admin"],
-        ),
-        UserModel.create(
-            email="mod@test.com",
-            raw_password="Password2!",
-            group_id=group_map["moderator"],
-        ),
-        UserModel.create(
-            email="user@test.com", raw_password="Password3!", group_id=group_map["user"]
-        ),
+        {"email": "admin@test.com", "group_id": group_map["admin"]},
+        {"email": "mod@test.com", "group_id": group_map["moderator"]},
+        {"email": "user@test.com", "group_id": group_map["user"]},
     ]
-
-    # session.add_all(users)
-    for user in users:
-        if user.email not in existing_emails:
-            session.add(user)
-    await session.flush()
+    passwords = ["Password1!", "Password2!", "Password3!"]
+
+    # Only the hashing runs in threads, the rows are built on the loop. argon2
+    # releases the GIL while it hashes, so only that part of the three calls
+    # overlaps; the (cheap) strength checks still run one at a time.
+    hashed_passwords = await asyncio.gather(
+        *(
+            asyncio.to_thread(UserModel.hash_new_password, password)
+            for password in passwords
+        )
+    )
+    for user, hashed_password in zip(users, hashed_passwords):
+        user["hashed_password"] = hashed_password
+
+    # Already-present users are skipped by the database in the same statement.
+    insert_users = pg_insert if _is_postgres(session) else sqlite_insert
+    await session.execute(
+        insert_users(UserModel.__table__)
+        .values(users)
+        .on_conflict_do_nothing(index_elements=["email"])
+    )
 
     print("✅ Users seeded successfully")
 
@@ -259,8 +498,6 @@ async def seed_orders(session: AsyncSession) -> None:
 
     paid_order.total_amount = price
 
-    await session.flush()
-
     print("✅ Seeded 1 PENDING and 1 PAID order")
 
 
@@ -7,25 +7,35 @@ from src.database.populate_db import (
 )
 from src.database.session_db import AsyncSessionLocal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.database import UserGroupModel, UserGroupEnum
+from sqlalchemy import literal, select
+from src.database import MovieModel, UserGroupModel, UserGroupEnum
 
 
 async def main():
 
-    async with AsyncSessionLocal() as session:
-        exists = await session.execute(
-            select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.ADMIN)
+    # One transaction for the whole seed: a single COMMIT at the end of the
+    # block instead of one per step.
+    async with AsyncSessionLocal() as session, session.begin():
+        exists = await session.scalar(
+            select(literal(1))
+            .select_from(UserGroupModel)
+            .where(UserGroupModel.name == UserGroupEnum.ADMIN)
+            .limit(1)
         )
-        if exists.scalar_one_or_none():
+        if exists:
             return
 
         await seed_user_groups(session)
-        await seed_movies(session)
+        # Don't pile another batch of movies onto a catalogue that is already
+        # there (e.g. a restart after a partially reset database).
+        has_movies = await session.scalar(
+            select(literal(1)).select_from(MovieModel).limit(1)
+        )
+        if not has_movies:
+            await seed_movies(session)
         await seed_users(session)
         await seed_orders(session)
-        await session.commit()
-        print("✅ DB seeded successfully!")
+    print("✅ DB seeded successfully!")
 
 
 if __name__ == "__main__":
@@ -1,20 +1,16 @@
-import os
+import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from src.config.get_settings import get_settings
-
-from fastapi.security import HTTPBearer
-
-
-bearer_scheme = HTTPBearer(auto_error=False)
+from src.config.get_settings import get_settings, ENVIRONMENT
 
 
 settings = get_settings()
-is_testing = os.getenv("ENVIRONMENT") == "testing"
+is_testing = ENVIRONMENT == "testing"
 
 if is_testing:
     DATABASE_URL_ASYNC = f"sqlite+aiosqlite:///{settings.PATH_TO_DB}"
@@ -31,7 +27,35 @@ else:
     )
 
 
-async_engine = create_async_engine(DATABASE_URL_ASYNC, echo=False)
+# Multi-row executemany INSERTs (e.g. the seed) are sent as batched
+# INSERT ... VALUES (...), (...) RETURNING statements of this many rows.
+INSERTMANYVALUES_PAGE_SIZE = 1000
+
+# Sized for concurrent request handling: connections are checked before use
+# and recycled before server-side idle timeouts, and asyncpg keeps more
+# prepared statements per connection than its default of 100.
+POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 40,
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "connect_args": {
+        "statement_cache_size": 1024,
+        "server_settings": {"jit": "off"},
+    },
+}
+
+if is_testing:
+    # Reuse the SQLite engine instead of opening a second pool on the same file.
+    from src.database.session_sqlite import sqlite_engine as async_engine
+else:
+    async_engine = create_async_engine(
+        DATABASE_URL_ASYNC,
+        echo=False,
+        insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+        **POOL_OPTIONS,
+    )
 
 AsyncSessionLocal = sessionmaker(
     async_engine,
@@ -42,7 +66,32 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
-sync_engine = create_engine(DATABASE_URL_SYNC, echo=False)
+async def warm_up_pool() -> None:
+    """
+    Open `pool_size` connections up front so the first requests after startup
+    don't pay for connection setup.
+
+    All connections are checked out at once, then returned to the pool.
+    Nothing is done for the SQLite engine used in tests.
+    """
+    if is_testing:
+        return
+
+    connections = await asyncio.gather(
+        *(async_engine.connect().start() for _ in range(POOL_OPTIONS["pool_size"]))
+    )
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+@lru_cache(maxsize=1)
+def get_sync_engine() -> Engine:
+    """
+    Return the synchronous engine (Alembic, Celery tasks), created on first use.
+
+    The API only needs the async engine, so it no longer opens a second
+    engine and pool at import time.
+    """
+    return create_engine(DATABASE_URL_SYNC, echo=False)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
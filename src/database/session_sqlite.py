@@ -1,7 +1,9 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from sqlalchemy.orm import sessionmaker
 
 from src.config.get_settings import get_settings
@@ -10,7 +12,41 @@ from src.database import Base
 settings = get_settings()
 
 SQLITE_DATABASE_URL = f"sqlite+aiosqlite:///{settings.PATH_TO_DB}"
-sqlite_engine = create_async_engine(SQLITE_DATABASE_URL, echo=False)
+IS_IN_MEMORY = settings.PATH_TO_DB == ":memory:"
+
+if IS_IN_MEMORY:
+    # Every new connection to :memory: is a separate, empty database, so all
+    # sessions must share the single connection of a StaticPool.
+    POOL_OPTIONS = {"poolclass": StaticPool}
+else:
+    POOL_OPTIONS = {"poolclass": AsyncAdaptedQueuePool, "pool_size": 10}
+
+sqlite_engine = create_async_engine(
+    SQLITE_DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    **POOL_OPTIONS,
+)
+
+
+
+@event.listens_for(sqlite_engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Apply the connection pragmas once per new connection.
+
+    SQLite leaves foreign keys (and so ON DELETE CASCADE) off unless every
+    connection turns them on; the rest only applies to file databases.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    if not IS_IN_MEMORY:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
+
+
 AsyncSQLiteSessionLocal = sessionmaker(  # type: ignore
     bind=sqlite_engine, class_=AsyncSession, expire_on_commit=False
 )
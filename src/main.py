@@ -1,3 +1,4 @@
+import logging
 import os
 import secrets
 
@@ -6,6 +7,8 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from src.storages.lifespan import lifespan
+from src.config.get_current_user import get_current_user
+from src.security.http import add_bearer_security
 
 
 from src.routes import (
@@ -24,6 +27,8 @@ from src.routes import (
 )
 
 
+logging.basicConfig(level=logging.INFO)
+
 security = HTTPBasic()
 
 
@@ -84,11 +89,12 @@ def custom_swagger_ui(auth=Depends(swagger_auth)):
 
 @app.get("/openapi.json", include_in_schema=False)
 def openapi(auth=Depends(swagger_auth)):
-    return get_openapi(
+    schema = get_openapi(
         title="Movies",
         version="1.0.0",
         routes=app.routes,
     )
+    return add_bearer_security(schema, app.routes, get_current_user)
 
 
 app.include_router(admin_router)
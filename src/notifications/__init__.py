@@ -1,2 +1,19 @@
-from src.notifications.interfaces import EmailSenderInterface
+from src.notifications.interfaces import (
+    EmailSenderInterface,
+    EmailMessage,
+    EmailKind,
+    SendResult,
+    SendStatus,
+)
 from src.notifications.emails import EmailSender
+from src.notifications.sinks import NullEmailSender, CollectingEmailSender
+from src.notifications.payloads import (
+    EmailPayload,
+    ActivationCtx,
+    ActivationCompleteCtx,
+    PasswordResetCtx,
+    PasswordResetCompleteCtx,
+    CommentReplyCtx,
+    CommentLikeCtx,
+    PaymentCtx,
+)
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DeliveryExecutor(Generic[T, R]):
+    """
+    Group-commit style batching of concurrent deliveries.
+
+    Callers `submit` single items and await their own result. A background
+    worker collects up to `max_batch` pending items, waiting at most
+    `max_wait` seconds after the first one, and hands the whole batch to
+    `deliver`, which must return one result per item in the same order.
+    Up to `max_concurrent_flushes` batches are delivered at once, so the next
+    batch is collected while the previous one is still on the wire.
+
+    Like `SMTPConnectionPool`, the executor belongs to the event loop it was
+    first used in and starts over when it is used from another one. The
+    worker only runs while there is something to deliver.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Sequence[T]], Awaitable[Sequence[R]]],
+        max_batch: int = 64,
+        max_wait: float = 0.01,
+        max_concurrent_flushes: int = 2,
+    ) -> None:
+        self._deliver = deliver
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._max_concurrent_flushes = max_concurrent_flushes
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flush_slots: Optional[asyncio.Semaphore] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = None
+        self._flush_slots = asyncio.Semaphore(self._max_concurrent_flushes)
+        self._inflight = set()
+
+    async def submit(self, item: T) -> R:
+        """
+        Queue `item` for the next batch and wait for its result.
+
+        Raises:
+            Exception: Whatever `deliver` raised for the batch the item was in.
+        """
+        self._bind_to_running_loop()
+        future = self._loop.create_future()
+        self._queue.put_nowait((item, future))
+        if self._worker is None or self._worker.done():
+            self._worker = self._loop.create_task(self._run())
+        return await future
+
+    async def _collect(self) -> list[tuple[T, asyncio.Future]]:
+        batch = [self._queue.get_nowait()]
+        deadline = self._loop.time() + self._max_wait
+        while len(batch) < self._max_batch:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self._deliver([item for item, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _flush_and_release(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        try:
+            await self._flush(batch)
+        finally:
+            self._flush_slots.release()
+
+    async def _run(self) -> None:
+        while not self._queue.empty():
+            batch = await self._collect()
+            await self._flush_slots.acquire()
+            task = self._loop.create_task(self._flush_and_release(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def close(self) -> None:
+        """
+        Wait until everything submitted so far has been delivered.
+        """
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            return
+        await self._worker
+        await asyncio.gather(*self._inflight)
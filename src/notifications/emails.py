@@ -1,12 +1,43 @@
+import asyncio
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from dataclasses import replace
+from typing import Optional, Sequence
 
 import aiosmtplib
-from jinja2 import Environment, FileSystemLoader
+from markupsafe import escape
 
 from src.exceptions import BaseEmailError
-from src.notifications.interfaces import EmailSenderInterface
+from src.notifications.delivery import DeliveryExecutor
+from src.notifications.interfaces import (
+    EmailKind,
+    EmailMessage,
+    EmailSenderInterface,
+    SendResult,
+    SendStatus,
+)
+from src.notifications.mime import build_mime
+from src.notifications.payloads import EmailPayload
+from src.notifications.smtp_pool import SMTPConnectionPool
+from src.notifications.templates import get_template
+from src.notifications.throttle import SendLimiter
+
+# Replies meaning "try again later": service unavailable, mailbox busy,
+# insufficient storage.
+BACKOFF_CODES = frozenset({421, 450, 452})
+
+# Rendered in place of the recipient's address by `send_many`; survives HTML
+# escaping unchanged and can never be a real address.
+RECIPIENT_PLACEHOLDER = "recipient.address.invalid"
+
+
+def _address(message: EmailMessage, recipient: str) -> EmailMessage:
+    """Put `recipient` where `message` was rendered with the placeholder."""
+    return EmailMessage(
+        recipient,
+        message.subject.replace(RECIPIENT_PLACEHOLDER, recipient),
+        message.html_content.replace(RECIPIENT_PLACEHOLDER, str(escape(recipient))),
+        message.text_content.replace(RECIPIENT_PLACEHOLDER, recipient),
+    )
 
 
 class EmailSender(EmailSenderInterface):
@@ -26,26 +57,141 @@ class EmailSender(EmailSenderInterface):
         comment_reply_template_name: str,
         comment_like_template_name: str,
         payment_email_template_name: str,
+        max_batch: int = 64,
+        max_wait: float = 0.01,
+        max_concurrent_flushes: int = 2,
+        send_concurrency: int = 100,
+        throttled_send_concurrency: int = 5,
+        send_byte_budget: int = 5_000_000,
+        backoff_seconds: float = 60,
     ) -> None:
         self._hostname = hostname
         self._port = port
         self._email = email
         self._password = password
         self._use_tls = use_tls
-        self._activation_email_template_name = activation_email_template_name
-        self._activation_complete_email_template_name = (
-            activation_complete_email_template_name
+        # (template name, subject, plain-text body) per EmailKind. The subject
+        # and the plain-text body are str.format strings over the payload.
+        self._kinds: tuple[tuple[str, str, str], ...] = (
+            (
+                activation_email_template_name,
+                "Account Activation",
+                "A registration request was made using your email: {ctx.email}.\n"
+                "To complete your registration, follow this link:\n"
+                "{ctx.activation_link}\n",
+            ),
+            (
+                activation_complete_email_template_name,
+                "Account Activated Successfully",
+                "Your account {ctx.email} has been successfully activated.\n"
+                "Log in here:\n{ctx.login_link}\n",
+            ),
+            (
+                password_email_template_name,
+                "Password Reset Request",
+                "A request to reset the password for {ctx.email} has been received.\n"
+                "To reset your password, follow this link:\n{ctx.reset_link}\n",
+            ),
+            (
+                password_complete_email_template_name,
+                "Your Password Has Been Successfully Reset",
+                "The password for {ctx.email} has been successfully updated.\n"
+                "Log in here:\n{ctx.login_link}\n",
+            ),
+            (
+                comment_reply_template_name,
+                "Your comment is replied",
+                "Your comment\n{ctx.parent_preview}\ngot a reply:\n"
+                "{ctx.current_preview}\nSee it here:\n{ctx.reply_link}\n",
+            ),
+            (
+                comment_like_template_name,
+                "Your comment is liked",
+                "Your comment\n{ctx.parent_preview}\nwas liked.\n"
+                "See it here:\n{ctx.comment_link}\n",
+            ),
+            (
+                payment_email_template_name,
+                "{ctx.header}",
+                "{ctx.header}\n\n{ctx.message}\n",
+            ),
         )
-        self._password_email_template_name = password_email_template_name
-        self._password_complete_email_template_name = (
-            password_complete_email_template_name
+        self._template_dir = template_dir
+        self._background: set[asyncio.Task] = set()
+        self._backoff_seconds = backoff_seconds
+        self._limiter = SendLimiter(
+            concurrency=send_concurrency,
+            throttled_concurrency=throttled_send_concurrency,
+            byte_budget=send_byte_budget,
         )
-        self._comment_reply_template_name = comment_reply_template_name
-        self._comment_like_template_name = comment_like_template_name
+        self._pool = SMTPConnectionPool(
+            hostname=hostname,
+            port=port,
+            email=email,
+            password=password,
+            use_tls=use_tls,
+            max_size=max_concurrent_flushes,
+        )
+        self._executor: DeliveryExecutor[EmailMessage, Optional[BaseEmailError]] = (
+            DeliveryExecutor(
+                self.send_batch,
+                max_batch=max_batch,
+                max_wait=max_wait,
+                max_concurrent_flushes=max_concurrent_flushes,
+            )
+        )
+
+    async def _deliver(
+        self, outgoing: list[tuple[list[str], str]]
+    ) -> list[Optional[aiosmtplib.SMTPException]]:
+        """
+        Send `(recipients, message)` pairs over a single pooled SMTP session.
 
-        self._payment_email_template_name = payment_email_template_name
+        Sends are throttled for a while after the server answers with a
+        "try again later" reply.
+        """
+        async with self._limiter.limit(sum(len(body) for _, body in outgoing)):
+            errors = await self._pool.sendmail_many(self._email, outgoing)
+        if any(
+            isinstance(error, aiosmtplib.SMTPResponseException)
+            and error.code in BACKOFF_CODES
+            for error in errors
+        ):
+            logging.warning(
+                f"SMTP server is busy, throttling for {self._backoff_seconds}s"
+            )
+            self._limiter.set_backoff(self._backoff_seconds)
+        return errors
 
-        self._env = Environment(loader=FileSystemLoader(template_dir))
+    async def send_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[Optional[BaseEmailError]]:
+        """
+        Deliver several emails over a single pooled SMTP session.
+
+        Args:
+            messages (Sequence[EmailMessage]): The emails to deliver.
+
+        Returns:
+            list[Optional[BaseEmailError]]: `None` for every delivered email,
+            the error for every failed one.
+        """
+        errors = await self._deliver(
+            [
+                ([message.recipient], build_mime(self._email, message))
+                for message in messages
+            ]
+        )
+        results: list[Optional[BaseEmailError]] = []
+        for message, error in zip(messages, errors):
+            if error is None:
+                results.append(None)
+                continue
+            logging.error(f"Failed to send email to {message.recipient}: {error}")
+            results.append(
+                BaseEmailError(f"Failed to send email to {message.recipient}: {error}")
+            )
+        return results
 
     async def _send_email(
         self, recipient: str, subject: str, html_content: str
@@ -53,6 +199,9 @@ class EmailSender(EmailSenderInterface):
         """
         Asynchronously send an email with the given subject and HTML content.
 
+        The email is queued and delivered together with the ones sent
+        concurrently by other requests.
+
         Args:
             recipient (str): The recipient's email address.
             subject (str): The subject of the email.
@@ -61,110 +210,130 @@ class EmailSender(EmailSenderInterface):
         Raises:
             BaseEmailError: If sending the email fails.
         """
-        message = MIMEMultipart()
-        message["From"] = self._email
-        message["To"] = recipient
-        message["Subject"] = subject
-        message.attach(MIMEText(html_content, "html"))
+        await self._send_message(EmailMessage(recipient, subject, html_content))
 
-        try:
-            smtp = aiosmtplib.SMTP(
-                hostname=self._hostname, port=self._port, start_tls=self._use_tls
-            )
-            await smtp.connect()
-            if self._use_tls:
-                await smtp.starttls()
-            await smtp.login(self._email, self._password)
-            await smtp.sendmail(self._email, [recipient], message.as_string())
-            await smtp.quit()
-        except aiosmtplib.SMTPException as error:
-            logging.error(f"Failed to send email to {recipient}: {error}")
-            raise BaseEmailError(f"Failed to send email to {recipient}: {error}")
-
-    async def send_activation_email(self, email: str, activation_link: str) -> None:
-        """
-        Send an account activation email asynchronously.
+    async def _send_message(self, message: EmailMessage) -> None:
+        error = await self._executor.submit(message)
+        if error is not None:
+            raise error
 
-        Args:
-            email (str): The recipient's email address.
-            activation_link (str): The activation link to be included in the email.
+    async def warmup(self) -> None:
         """
-        template = self._env.get_template(self._activation_email_template_name)
-        html_content = template.render(email=email, activation_link=activation_link)
-        subject = "Account Activation"
-        await self._send_email(email, subject, html_content)
-
-    async def send_activation_complete_email(self, email: str, login_link: str) -> None:
+        Compile every notification template up front, so the first email of
+        each kind does not pay for it.
         """
-        Send an account activation completion email asynchronously.
+        for template_name, _, _ in self._kinds:
+            get_template(self._template_dir, template_name)
 
-        Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to be included in the email.
-        """
-        template = self._env.get_template(self._activation_complete_email_template_name)
-        html_content = template.render(email=email, login_link=login_link)
-        subject = "Account Activated Successfully"
-        await self._send_email(email, subject, html_content)
+    async def _send_in_background(self, message: EmailMessage) -> None:
+        try:
+            await self._send_message(message)
+        except BaseEmailError:
+            pass  # Already logged by send_batch.
+        except Exception as error:
+            logging.error(f"Failed to send email to {message.recipient}: {error}")
 
-    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
+    async def close(self) -> None:
         """
-        Send a password reset request email asynchronously.
-
-        Args:
-            email (str): The recipient's email address.
-            reset_link (str): The reset link to be included in the email.
+        Deliver the queued emails and close the pooled SMTP connections.
         """
-        template = self._env.get_template(self._password_email_template_name)
-        html_content = template.render(email=email, reset_link=reset_link)
-        subject = "Password Reset Request"
-        await self._send_email(email, subject, html_content)
+        await asyncio.gather(*self._background)
+        await self._executor.close()
+        await self._pool.close()
 
-    async def send_password_reset_complete_email(
-        self, email: str, login_link: str
-    ) -> None:
+    def _render(self, kind: EmailKind, ctx: EmailPayload) -> EmailMessage:
+        template_name, subject, text = self._kinds[kind]
+        template = get_template(self._template_dir, template_name)
+        return EmailMessage(
+            ctx.email,
+            subject.format(ctx=ctx),
+            template.render(ctx=ctx),
+            text.format(ctx=ctx),
+        )
+
+    async def send(
+        self, kind: EmailKind, ctx: EmailPayload, send_async: bool = False
+    ) -> SendResult:
         """
-        Send a password reset completion email asynchronously.
+        Render the template of `kind` and send it asynchronously.
 
         Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to be included in the email.
+            kind (EmailKind): Which notification to send.
+            ctx (EmailPayload): The recipient and the values the template of
+                `kind` expects.
+            send_async (bool): Return once the email is queued; delivery
+                errors are then only logged.
+
+        Returns:
+            SendResult: Whether the email was sent or only queued.
+
+        Raises:
+            BaseEmailError: If sending the email fails and `send_async` is false.
         """
-        template = self._env.get_template(self._password_complete_email_template_name)
-        html_content = template.render(email=email, login_link=login_link)
-        subject = "Your Password Has Been Successfully Reset"
-        await self._send_email(email, subject, html_content)
+        message = self._render(kind, ctx)
+        if send_async:
+            task = asyncio.create_task(self._send_in_background(message))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            return SendResult(SendStatus.QUEUED)
 
-    async def send_comment_reply_email(
-        self, email: str, parent_preview: str, current_preview: str, reply_link: str
-    ) -> None:
+        await self._send_message(message)
+        return SendResult(SendStatus.SENT)
 
-        template = self._env.get_template(self._comment_reply_template_name)
-        html_content = template.render(
-            email=email,
-            parent_preview=parent_preview,
-            current_preview=current_preview,
-            reply_link=reply_link,
-        )
-        subject = "Your comment is replied"
-        await self._send_email(email, subject, html_content)
+    async def send_many(
+        self, kind: EmailKind, recipients: Sequence[str], ctx: EmailPayload
+    ) -> SendResult:
+        """
+        Render one email and send it to all `recipients` over one SMTP
+        session.
 
-    async def send_comment_like_email(
-        self, email: str, parent_preview: str, comment_link: str
-    ) -> None:
+        The template is rendered once, with a placeholder for the address.
+        If the address does not appear in the email, it goes out in a single
+        transaction; the recipients are then only in the envelope, so they
+        do not see each other's addresses. Otherwise each recipient gets a
+        copy with their own address filled in.
 
-        template = self._env.get_template(self._comment_like_template_name)
-        html_content = template.render(
-            email=email,
-            parent_preview=parent_preview,
-            comment_link=comment_link,
-        )
-        subject = "Your comment is liked"
-        await self._send_email(email, subject, html_content)
+        Args:
+            kind (EmailKind): Which notification to send.
+            recipients (Sequence[str]): The recipients' email addresses.
+            ctx (EmailPayload): The values the template of `kind` expects;
+                its `email` is replaced by each recipient.
+
+        Returns:
+            SendResult: The emails were sent.
 
-    async def send_payment_email(self, email: str, header: str, message: str) -> None:
+        Raises:
+            BaseEmailError: If sending to any recipient fails.
+        """
+        if not recipients:
+            return SendResult(SendStatus.SENT)
+        message = self._render(kind, replace(ctx, email=RECIPIENT_PLACEHOLDER))
+        if any(
+            RECIPIENT_PLACEHOLDER in part
+            for part in (message.subject, message.html_content, message.text_content)
+        ):
+            outgoing = [
+                ([recipient], build_mime(self._email, _address(message, recipient)))
+                for recipient in recipients
+            ]
+        else:
+            message = replace(message, recipient="undisclosed-recipients:;")
+            outgoing = [(list(recipients), build_mime(self._email, message))]
 
-        template = self._env.get_template(self._payment_email_template_name)
-        html_content = template.render(email=email, header=header, message=message)
-        subject = header
-        await self._send_email(email, subject, html_content)
+        errors = [e for e in await self._deliver(outgoing) if e is not None]
+        if errors:
+            detail = (
+                f"Failed to send email to {len(recipients)} recipients: {errors[0]}"
+            )
+            logging.error(detail)
+            raise BaseEmailError(detail)
+        return SendResult(SendStatus.SENT)
+        message = replace(self._render(kind, ctx), recipient="undisclosed-recipients:;")
+        (error,) = await self._deliver(
+            [(list(recipients), build_mime(self._email, message))]
+        )
+        if error is not None:
+            detail = f"Failed to send email to {len(recipients)} recipients: {error}"
+            logging.error(detail)
+            raise BaseEmailError(detail)
+        return SendResult(SendStatus.SENT)
@@ -1,66 +1,204 @@
-from abc import ABC, abstractmethod
+import asyncio
+import enum
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence
 
+from src.exceptions import BaseEmailError
+from src.notifications.payloads import (
+    ActivationCompleteCtx,
+    ActivationCtx,
+    CommentLikeCtx,
+    CommentReplyCtx,
+    EmailPayload,
+    PasswordResetCompleteCtx,
+    PasswordResetCtx,
+    PaymentCtx,
+)
 
-class EmailSenderInterface(ABC):
 
-    @abstractmethod
-    async def send_activation_email(self, email: str, activation_link: str) -> None:
+@dataclass(frozen=True)
+class EmailMessage:
+    """
+    A rendered email ready to be delivered.
+    """
+
+    recipient: str
+    subject: str
+    html_content: str
+    text_content: str = ""
+
+
+class SendStatus(str, enum.Enum):
+    SENT = "sent"
+    QUEUED = "queued"
+
+
+@dataclass(slots=True, frozen=True)
+class SendResult:
+    """
+    The outcome of handing an email to a sender.
+
+    `QUEUED` means the email will be delivered in the background and
+    delivery errors are only logged.
+    """
+
+    status: SendStatus
+
+
+class EmailKind(enum.IntEnum):
+    """
+    The kinds of notification emails, in the order of the senders' tables.
+    """
+
+    ACTIVATION = 0
+    ACTIVATION_COMPLETE = 1
+    PASSWORD_RESET = 2
+    PASSWORD_RESET_COMPLETE = 3
+    COMMENT_REPLY = 4
+    COMMENT_LIKE = 5
+    PAYMENT = 6
+
+
+class EmailSenderInterface:
+    """
+    Base class of the email senders.
+
+    Subclasses must implement `send` and `send_batch`; this is checked once,
+    when the subclass is defined, rather than on every instantiation.
+    """
+
+    _required_methods = ("send", "send_batch")
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        missing = [
+            name
+            for name in cls._required_methods
+            if getattr(cls, name) is getattr(EmailSenderInterface, name)
+        ]
+        if missing:
+            raise TypeError(
+                f"{cls.__name__} must implement {', '.join(missing)} "
+                "to be an EmailSenderInterface"
+            )
+
+    async def send(
+        self, kind: EmailKind, ctx: EmailPayload, send_async: bool = False
+    ) -> SendResult:
+        """
+        Asynchronously render and send a notification email.
+
+        Args:
+            kind (EmailKind): Which notification to send.
+            ctx (EmailPayload): The recipient and the values the template of
+                `kind` expects.
+            send_async (bool): Return as soon as the email is queued instead
+                of waiting for its delivery (e.g. for bulk imports).
+
+        Returns:
+            SendResult: Whether the email was sent or only queued.
+
+        Raises:
+            BaseEmailError: If the email could not be sent (only when
+                `send_async` is false).
+        """
+        raise NotImplementedError
+
+    async def send_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> Sequence[Optional[BaseEmailError]]:
+        """
+        Asynchronously deliver several rendered emails in one go.
+
+        Args:
+            messages (Sequence[EmailMessage]): The emails to deliver.
+
+        Returns:
+            Sequence[Optional[BaseEmailError]]: One entry per message, `None`
+            if it was delivered and the error otherwise.
+        """
+        raise NotImplementedError
+
+    async def send_many(
+        self, kind: EmailKind, recipients: Sequence[str], ctx: EmailPayload
+    ) -> SendResult:
+        """
+        Asynchronously send the same notification to several recipients.
+
+        Senders that can render once and share one SMTP transaction should
+        override this; by default each recipient gets their own `send`.
+
+        Args:
+            kind (EmailKind): Which notification to send.
+            recipients (Sequence[str]): The recipients' email addresses.
+            ctx (EmailPayload): The values the template of `kind` expects;
+                its `email` is replaced by each recipient.
+
+        Returns:
+            SendResult: Whether the emails were sent or only queued.
+        """
+        results = await asyncio.gather(
+            *(self.send(kind, replace(ctx, email=email)) for email in recipients)
+        )
+        return results[0] if results else SendResult(SendStatus.SENT)
+
+    async def warmup(self) -> None:
+        """
+        Prepare the sender ahead of its first use (e.g. at startup).
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        Release any resources held by the sender.
+        """
+        return None
+
+    async def send_activation_email(self, ctx: ActivationCtx) -> SendResult:
         """
         Asynchronously send an account activation email.
 
         Args:
-            email (str): The recipient's email address.
-            activation_link (str): The activation link to include in the email.
+            ctx (ActivationCtx): The recipient and the activation link.
         """
-        pass
+        return await self.send(EmailKind.ACTIVATION, ctx)
 
-    @abstractmethod
-    async def send_activation_complete_email(self, email: str, login_link: str) -> None:
+    async def send_activation_complete_email(
+        self, ctx: ActivationCompleteCtx
+    ) -> SendResult:
         """
         Asynchronously send an email confirming that the account has been activated.
 
         Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to include in the email.
+            ctx (ActivationCompleteCtx): The recipient and the login link.
         """
-        pass
+        return await self.send(EmailKind.ACTIVATION_COMPLETE, ctx)
 
-    @abstractmethod
-    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
+    async def send_password_reset_email(self, ctx: PasswordResetCtx) -> SendResult:
         """
         Asynchronously send a password reset request email.
 
         Args:
-            email (str): The recipient's email address.
-            reset_link (str): The password reset link to include in the email.
+            ctx (PasswordResetCtx): The recipient and the password reset link.
         """
-        pass
+        return await self.send(EmailKind.PASSWORD_RESET, ctx)
 
-    @abstractmethod
     async def send_password_reset_complete_email(
-        self, email: str, login_link: str
-    ) -> None:
+        self, ctx: PasswordResetCompleteCtx
+    ) -> SendResult:
         """
         Asynchronously send an email confirming that the password has been reset.
 
         Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to include in the email.
-        """
-        pass
-
-    @abstractmethod
-    async def send_comment_reply_email(
-        self, email: str, parent_preview: str, current_preview: str, reply_link: str
-    ):
-        pass
-
-    @abstractmethod
-    async def send_comment_like_email(
-        self, email: str, parent_preview: str, comment_link: str
-    ):
-        pass
-
-    @abstractmethod
-    async def send_payment_email(self, email: str, header: str, message: str):
-        pass
+            ctx (PasswordResetCompleteCtx): The recipient and the login link.
+        """
+        return await self.send(EmailKind.PASSWORD_RESET_COMPLETE, ctx)
+
+    async def send_comment_reply_email(self, ctx: CommentReplyCtx) -> SendResult:
+        return await self.send(EmailKind.COMMENT_REPLY, ctx)
+
+    async def send_comment_like_email(self, ctx: CommentLikeCtx) -> SendResult:
+        return await self.send(EmailKind.COMMENT_LIKE, ctx)
+
+    async def send_payment_email(self, ctx: PaymentCtx) -> SendResult:
+        return await self.send(EmailKind.PAYMENT, ctx)
@@ -0,0 +1,64 @@
+import base64
+from email.header import Header
+from email.utils import formataddr, parseaddr
+from functools import lru_cache
+
+from src.notifications.interfaces import EmailMessage
+
+# Contains "_" and ".", which never occur in base64, and is checked against
+# parts sent unencoded.
+BOUNDARY = "=_cinema.notification_="
+
+_MULTIPART_HEADERS = f'Content-Type: multipart/alternative; boundary="{BOUNDARY}"\n'
+
+
+@lru_cache(maxsize=None)
+def _envelope_prefix(sender: str) -> str:
+    # Only the display name may be encoded; an encoded address is unreadable.
+    return f"From: {formataddr(parseaddr(sender), 'utf-8')}\nMIME-Version: 1.0\n"
+
+
+def _encode_header(value: str) -> str:
+    # Encoded words also keep line breaks from starting a new header.
+    if value.isascii() and "\n" not in value and "\r" not in value:
+        return value
+    return Header(value, "utf-8").encode()
+
+
+def _part(subtype: str, content: str) -> str:
+    # Same choice as MIMEText: ASCII goes out as-is, anything else as base64.
+    if content.isascii() and BOUNDARY not in content:
+        return (
+            f'Content-Type: text/{subtype}; charset="us-ascii"\n'
+            "Content-Transfer-Encoding: 7bit\n\n"
+            f"{content}\n"
+        )
+    return (
+        f'Content-Type: text/{subtype}; charset="utf-8"\n'
+        "Content-Transfer-Encoding: base64\n\n"
+        f"{base64.encodebytes(content.encode()).decode('ascii')}"
+    )
+
+
+def build_mime(sender: str, message: EmailMessage) -> str:
+    """
+    Serialise `message` as a MIME document.
+
+    Every notification has the same shape (an HTML part and optionally a
+    plain-text alternative), so the document is assembled from prebuilt
+    header fragments instead of going through `email.generator`. Line
+    endings and dot-stuffing are left to the SMTP client.
+    """
+    headers = (
+        f"{_envelope_prefix(sender)}"
+        f"To: {_encode_header(message.recipient)}\n"
+        f"Subject: {_encode_header(message.subject)}\n"
+    )
+    if not message.text_content:
+        return headers + _part("html", message.html_content)
+    return (
+        f"{headers}{_MULTIPART_HEADERS}\n"
+        f"--{BOUNDARY}\n{_part('plain', message.text_content)}"
+        f"--{BOUNDARY}\n{_part('html', message.html_content)}"
+        f"--{BOUNDARY}--\n"
+    )
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class EmailPayload:
+    """
+    The values a notification template is rendered with, as `ctx`.
+    """
+
+    email: str
+
+
+@dataclass(slots=True, frozen=True)
+class ActivationCtx(EmailPayload):
+    activation_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class ActivationCompleteCtx(EmailPayload):
+    login_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class PasswordResetCtx(EmailPayload):
+    reset_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class PasswordResetCompleteCtx(EmailPayload):
+    login_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class CommentReplyCtx(EmailPayload):
+    parent_preview: str
+    current_preview: str
+    reply_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class CommentLikeCtx(EmailPayload):
+    parent_preview: str
+    comment_link: str
+
+
+@dataclass(slots=True, frozen=True)
+class PaymentCtx(EmailPayload):
+    header: str
+    message: str
@@ -0,0 +1,65 @@
+"""
+Email senders that never touch SMTP or the templates.
+
+Use them wherever emails must not go out, e.g. while importing users in
+bulk, by overriding the sender dependency for the duration of the import:
+
+    app.dependency_overrides[get_accounts_email_notificator] = NullEmailSender
+    try:
+        ...
+    finally:
+        app.dependency_overrides.pop(get_accounts_email_notificator)
+"""
+
+from typing import Optional, Sequence
+
+from src.exceptions import BaseEmailError
+from src.notifications.interfaces import (
+    EmailKind,
+    EmailMessage,
+    EmailSenderInterface,
+    SendResult,
+    SendStatus,
+)
+from src.notifications.payloads import EmailPayload
+
+
+class NullEmailSender(EmailSenderInterface):
+    """
+    Drop every email.
+    """
+
+    async def send(
+        self, kind: EmailKind, ctx: EmailPayload, send_async: bool = False
+    ) -> SendResult:
+        return SendResult(SendStatus.SENT)
+
+    async def send_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[Optional[BaseEmailError]]:
+        return [None] * len(messages)
+
+
+class CollectingEmailSender(EmailSenderInterface):
+    """
+    Record every email instead of sending it.
+
+    `sent` holds `(kind, ctx)` for each `send` call and `batched`
+    the messages passed to `send_batch`, in call order.
+    """
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[EmailKind, EmailPayload]] = []
+        self.batched: list[EmailMessage] = []
+
+    async def send(
+        self, kind: EmailKind, ctx: EmailPayload, send_async: bool = False
+    ) -> SendResult:
+        self.sent.append((kind, ctx))
+        return SendResult(SendStatus.SENT)
+
+    async def send_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[Optional[BaseEmailError]]:
+        self.batched.extend(messages)
+        return [None] * len(messages)
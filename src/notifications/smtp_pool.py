@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import aiosmtplib
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    __slots__ = ("client", "messages_sent", "last_used")
+
+    def __init__(self, client: aiosmtplib.SMTP) -> None:
+        self.client = client
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    A small pool of persistent, authenticated SMTP connections.
+
+    At most `max_size` connections are checked out at once. A connection is
+    returned to the pool after a successful send, dropped after any SMTP error
+    and recycled once it has delivered `messages_per_connection` messages.
+    A connection that has been idle for more than `ping_after` seconds is
+    checked with NOOP before it is reused.
+
+    The pool belongs to the event loop it was first used in; when it is used
+    from another loop (e.g. a Celery task running its own loop) the idle
+    connections of the previous loop are closed and new ones are opened.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        email: str,
+        password: str,
+        use_tls: bool,
+        max_size: int = 5,
+        messages_per_connection: int = 100,
+        timeout: float = 30,
+        ping_after: float = 30,
+    ) -> None:
+        self._hostname = hostname
+        self._port = port
+        self._email = email
+        self._password = password
+        self._use_tls = use_tls
+        self._max_size = max_size
+        self._messages_per_connection = messages_per_connection
+        self._timeout = timeout
+        self._ping_after = ping_after
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._idle is not None:
+            # The previous loop's connections cannot be used (or QUIT) from
+            # this one; close their sockets rather than leak them.
+            while not self._idle.empty():
+                connection = self._idle.get_nowait()
+                try:
+                    connection.client.close()
+                except RuntimeError:
+                    # Their loop is already closed, and its transports with it.
+                    pass
+        self._loop = loop
+        self._idle = asyncio.Queue(maxsize=self._max_size)
+        self._slots = asyncio.Semaphore(self._max_size)
+
+    async def _connect(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self._hostname,
+            port=self._port,
+            start_tls=self._use_tls,
+            timeout=self._timeout,
+        )
+        await smtp.connect()
+        if self._use_tls:
+            await smtp.starttls()
+        await smtp.login(self._email, self._password)
+        return _PooledConnection(smtp)
+
+    async def _checkout_idle(self) -> Optional[_PooledConnection]:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if time.monotonic() - connection.last_used < self._ping_after:
+                return connection
+            try:
+                await connection.client.noop()
+            except aiosmtplib.SMTPException:
+                logger.info("Idle SMTP connection did not answer NOOP, dropping it")
+                connection.client.close()
+                continue
+            return connection
+        return None
+
+    @staticmethod
+    async def _discard(connection: _PooledConnection) -> None:
+        try:
+            await connection.client.quit()
+        except aiosmtplib.SMTPException:
+            connection.client.close()
+
+    async def _send_one(
+        self,
+        connection: Optional[_PooledConnection],
+        sender: str,
+        recipients: list[str],
+        message: str,
+    ) -> Optional[_PooledConnection]:
+        """
+        Send one message, returning the connection if it can be reused.
+
+        The connection is closed on any error.
+        """
+        fresh = connection is None
+        if fresh:
+            connection = await self._connect()
+        try:
+            await connection.client.sendmail(sender, recipients, message)
+        except aiosmtplib.SMTPServerDisconnected:
+            connection.client.close()
+            if fresh:
+                raise
+            logger.info("Pooled SMTP connection was closed, reconnecting")
+            connection = await self._connect()
+            try:
+                await connection.client.sendmail(sender, recipients, message)
+            except BaseException:
+                connection.client.close()
+                raise
+        except BaseException:
+            connection.client.close()
+            raise
+
+        connection.messages_sent += 1
+        if connection.messages_sent >= self._messages_per_connection:
+            await self._discard(connection)
+            return None
+        return connection
+
+    async def sendmail_many(
+        self, sender: str, messages: list[tuple[list[str], str]]
+    ) -> list[Optional[aiosmtplib.SMTPException]]:
+        """
+        Send `(recipients, message)` pairs in order over one pooled connection.
+
+        A failed message does not abort the rest of the batch: the connection
+        is dropped and the next message goes out over a fresh one.
+
+        Returns:
+            list: `None` for every delivered message, the SMTP error otherwise.
+        """
+        self._bind_to_running_loop()
+        errors: list[Optional[aiosmtplib.SMTPException]] = []
+        async with self._slots:
+            connection = await self._checkout_idle()
+            for recipients, message in messages:
+                current, connection = connection, None
+                try:
+                    connection = await self._send_one(
+                        current, sender, recipients, message
+                    )
+                except aiosmtplib.SMTPException as error:
+                    errors.append(error)
+                else:
+                    errors.append(None)
+            if connection is not None:
+                connection.last_used = time.monotonic()
+                self._idle.put_nowait(connection)
+        return errors
+
+    async def sendmail(self, sender: str, recipients: list[str], message: str) -> None:
+        """
+        Send `message` over a pooled connection.
+
+        A stale idle connection (e.g. closed by the server) is replaced by a
+        fresh one and the send is retried once.
+
+        Raises:
+            aiosmtplib.SMTPException: If the message could not be delivered.
+        """
+        (error,) = await self.sendmail_many(sender, [(recipients, message)])
+        if error is not None:
+            raise error
+
+    async def close(self) -> None:
+        """
+        Close all idle connections of the pool.
+        """
+        if self._idle is None or self._loop is not asyncio.get_running_loop():
+            return
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+
+@lru_cache(maxsize=None)
+def get_environment(template_dir: str) -> Environment:
+    """
+    Return the shared Jinja environment for `template_dir`.
+
+    All templates are HTML, so autoescaping is always on. Templates are not
+    checked for changes after they are loaded, and their compiled bytecode
+    is kept on disk so new processes (e.g. Celery workers) skip the compile
+    step too.
+    """
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=True,
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_template(template_dir: str, name: str) -> Template:
+    """
+    Return the compiled template `name` from `template_dir`.
+    """
+    return get_environment(template_dir).get_template(name)
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+class SendLimiter:
+    """
+    Three layers of admission control for outgoing mail.
+
+    Every send holds one of `concurrency` slots and reserves its size in
+    bytes from `byte_budget`. While the server is asking us to back off
+    (see `set_backoff`) a send must also hold one of `throttled_concurrency`
+    slots, and its size counts `backoff_penalty` times against the budget,
+    so a few large emails cannot monopolise a throttled server.
+
+    Like `SMTPConnectionPool`, the limiter belongs to the event loop it was
+    first used in and starts over when it is used from another one.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 100,
+        throttled_concurrency: int = 5,
+        byte_budget: int = 5_000_000,
+        backoff_penalty: int = 4,
+    ) -> None:
+        self._concurrency = concurrency
+        self._throttled_concurrency = throttled_concurrency
+        self._byte_budget = byte_budget
+        self._backoff_penalty = backoff_penalty
+        self._backoff_until = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._throttled_slots: Optional[asyncio.Semaphore] = None
+        self._bytes_changed: Optional[asyncio.Condition] = None
+        self._bytes_available = byte_budget
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self._concurrency)
+        self._throttled_slots = asyncio.Semaphore(self._throttled_concurrency)
+        self._bytes_changed = asyncio.Condition()
+        self._bytes_available = self._byte_budget
+
+    @property
+    def backoff_active(self) -> bool:
+        return time.monotonic() < self._backoff_until
+
+    def set_backoff(self, retry_after: float) -> None:
+        """
+        Throttle sends for the next `retry_after` seconds.
+        """
+        self._backoff_until = max(self._backoff_until, time.monotonic() + retry_after)
+
+    async def _reserve(self, size: int) -> int:
+        # A single email larger than the whole budget still goes out alone.
+        size = min(size, self._byte_budget)
+        async with self._bytes_changed:
+            await self._bytes_changed.wait_for(lambda: self._bytes_available >= size)
+            self._bytes_available -= size
+        return size
+
+    async def _release(self, size: int) -> None:
+        async with self._bytes_changed:
+            self._bytes_available += size
+            self._bytes_changed.notify_all()
+
+    @asynccontextmanager
+    async def limit(self, size: int) -> AsyncIterator[None]:
+        """
+        Hold the slots and bytes needed to send `size` bytes of mail.
+        """
+        self._bind_to_running_loop()
+        async with self._slots:
+            if not self.backoff_active:
+                reserved = await self._reserve(size)
+                try:
+                    yield
+                finally:
+                    await self._release(reserved)
+                return
+            async with self._throttled_slots:
+                reserved = await self._reserve(size * self._backoff_penalty)
+                try:
+                    yield
+                finally:
+                    await self._release(reserved)
@@ -3,25 +3,32 @@ from datetime import datetime, timezone, timedelta
 import aioredis
 from typing import cast
 
-from fastapi import APIRouter, Depends, status, HTTPException, Response, Query, Form
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    status,
+    HTTPException,
+    Response,
+    Query,
+    Form,
+)
 from pydantic import EmailStr
-from sqlalchemy import select, delete
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import and_, bindparam, select, delete, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import defaultload, noload
+from fastapi.security import HTTPAuthorizationCredentials
 
 from src.config import (
     get_jwt_auth_manager,
     # get_settings,
     BaseAppSettings,
     get_accounts_email_notificator,
-    # get_current_user,
 )
-from src.config.get_settings import get_settings
+from src.config.get_settings import get_app_settings
 from src.database import (
     get_db,
-    # get_current_user,
     UserGroupModel,
     UserGroupEnum,
     ActivationTokenModel,
@@ -29,10 +36,20 @@ from src.database import (
     RefreshTokenModel,
     UserModel,
 )
-from src.config.get_current_user import get_current_user
+from src.config.get_current_user import (
+    get_current_user,
+    get_user_group_id,
+    invalidate_cached_user,
+)
 
 from src.exceptions import BaseSecurityError
-from src.notifications import EmailSenderInterface
+from src.notifications import (
+    EmailSenderInterface,
+    ActivationCtx,
+    ActivationCompleteCtx,
+    PasswordResetCtx,
+    PasswordResetCompleteCtx,
+)
 from src.schemas import (
     UserRegistrationRequestSchema,
     UserRegistrationResponseSchema,
@@ -47,6 +64,14 @@ from src.schemas import (
     TokenRefreshResponseSchema,
 )
 from src.security.interfaces import JWTAuthManagerInterface
+from src.security.passwords import hash_password, verify_password
+from src.security.http import bearer_scheme
+from src.routes.utils import (
+    activate_user_by_token,
+    is_unique_violation,
+    renew_user_token,
+    reset_password_with_token,
+)
 
 from src.tasks.redis_blacklist import (
     revoke_token,
@@ -55,11 +80,17 @@ from src.tasks.redis_blacklist import (
 from fastapi.security import OAuth2PasswordBearer
 
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/accounts/login/")
-bearer_scheme = HTTPBearer(auto_error=False)
 
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
+# Built once at import; requests only bind the email.
+_USER_BY_EMAIL = (
+    select(UserModel)
+    .options(noload(UserModel.rated_movies))
+    .where(UserModel.email == bindparam("email"))
+)
+
 
 @router.post(
     "/register/",
@@ -102,6 +133,7 @@ router = APIRouter(prefix="/accounts", tags=["accounts"])
     },
 )
 async def register_user(
+    background_tasks: BackgroundTasks,
     user_data: UserRegistrationRequestSchema,
     db: AsyncSession = Depends(get_db),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
@@ -117,6 +149,7 @@ async def register_user(
         user_data (UserRegistrationRequestSchema): The registration details including email and password.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): The asynchronous email sender.
+        background_tasks (BackgroundTasks): Sends the email after the response.
 
     Returns:
         UserRegistrationResponseSchema: The newly created user's details.
@@ -126,38 +159,41 @@ async def register_user(
             - 409 Conflict if a user with the same email exists.
             - 500 Internal Server Error if an error occurs during user creation.
     """
-    stmt = select(UserModel).where(UserModel.email == user_data.email)
-    result = await db.execute(stmt)
-    existing_user = result.scalars().first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"A user with this email {user_data.email} already exists.",
-        )
-
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db.execute(stmt)
-    user_group = result.scalars().first()
-    if not user_group:
+    user_group_id = await get_user_group_id(db, UserGroupEnum.USER)
+    if user_group_id is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Default user group not found.",
         )
 
     try:
-        new_user = UserModel.create(
+        # Hashing is CPU-bound; do it in a thread so the event loop keeps serving.
+        hashed_password = await asyncio.to_thread(
+            UserModel.hash_new_password, user_data.password
+        )
+        new_user = UserModel(
             email=str(user_data.email),
-            raw_password=user_data.password,
-            group_id=user_group.id,
+            group_id=user_group_id,
+            _hashed_password=hashed_password,
         )
+        # Both rows go out in the commit's flush; the user's id comes back
+        # from its INSERT ... RETURNING, so nothing needs to be refreshed.
+        activation_token = ActivationTokenModel()
+        new_user.activation_tokens.append(activation_token)
         db.add(new_user)
-        await db.flush()
-
-        activation_token = ActivationTokenModel(user_id=new_user.id)
-        db.add(activation_token)
-
         await db.commit()
-        await db.refresh(new_user)
+    except IntegrityError as e:
+        # The unique email constraint replaces a lookup before the insert.
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred during user creation.",
+            ) from e
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A user with this email {user_data.email} already exists.",
+        ) from e
     except SQLAlchemyError as e:
         await db.rollback()
         raise HTTPException(
@@ -167,7 +203,10 @@ async def register_user(
     else:
         activation_link = f"http://127.0.0.1:8000/accounts/activate/?email={new_user.email}&token={activation_token.token}"
 
-        await email_sender.send_activation_email(new_user.email, activation_link)
+        background_tasks.add_task(
+            email_sender.send_activation_email,
+            ActivationCtx(new_user.email, activation_link),
+        )
 
         return UserRegistrationResponseSchema.model_validate(new_user)
 
@@ -207,6 +246,7 @@ async def register_user(
     },
 )
 async def resend_activation(
+    background_tasks: BackgroundTasks,
     request: PasswordResetRequestSchema,  # reuse simple schema with `email` field
     db: AsyncSession = Depends(get_db),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
@@ -225,14 +265,14 @@ async def resend_activation(
         request (PasswordResetRequestSchema): Request containing the user's email.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): Service responsible for sending emails.
+        background_tasks (BackgroundTasks): Sends the email after the response.
 
     Returns:
         MessageResponseSchema: A generic response message indicating that
         instructions will be sent if applicable.
     """
 
-    stmt = select(UserModel).filter_by(email=request.email)
-    result = await db.execute(stmt)
+    result = await db.execute(_USER_BY_EMAIL, {"email": str(request.email)})
     user = result.scalars().first()
     # always return same message to avoid user enumeration
     if not user:
@@ -242,15 +282,14 @@ async def resend_activation(
     if user.is_active:
         return MessageResponseSchema(message="This user is already active.")
 
-    # Delete old activation token(s) and create new one
-    await db.execute(
-        delete(ActivationTokenModel).where(ActivationTokenModel.user_id == user.id)
-    )
-    new_token = ActivationTokenModel(user_id=user.id)
-    db.add(new_token)
+    # Replace the old activation token, if any, with a new one
+    new_token = await renew_user_token(db, ActivationTokenModel, user.id)
     await db.commit()
-    activation_link = f"http://127.0.0.1:8000/accounts/activate/?email={user.email}&token={new_token.token}"
-    await email_sender.send_activation_email(user.email, activation_link)
+    activation_link = f"http://127.0.0.1:8000/accounts/activate/?email={user.email}&token={new_token}"
+    background_tasks.add_task(
+        email_sender.send_activation_email,
+        ActivationCtx(user.email, activation_link),
+    )
     return MessageResponseSchema(message="You will receive an email with instructions.")
 
 
@@ -289,6 +328,7 @@ async def resend_activation(
     },
 )
 async def activate_account(
+    background_tasks: BackgroundTasks,
     email: EmailStr = Query(...),
     token: str = Query(...),
     db: AsyncSession = Depends(get_db),
@@ -309,6 +349,7 @@ async def activate_account(
         token (str): Activation token received via email.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): Service responsible for sending emails.
+        background_tasks (BackgroundTasks): Sends the email after the response.
 
     Returns:
         MessageResponseSchema: Confirmation message indicating successful activation.
@@ -318,39 +359,59 @@ async def activate_account(
             - 400 Bad Request if the token is invalid, expired, or already used.
     """
 
-    stmt = (
-        select(ActivationTokenModel)
-        .options(joinedload(ActivationTokenModel.user))
-        .join(UserModel)
-        .where(UserModel.email == email, ActivationTokenModel.token == token)
-    )
-    result = await db.execute(stmt)
-    token_record = result.scalars().first()
-
-    if not token_record or token_record.expires_at.replace(
-        tzinfo=timezone.utc
-    ) < datetime.now(timezone.utc):
-        if token_record:
-            await db.delete(token_record)
-            await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired activation token.",
-        )
-
-    user = token_record.user
-    if user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User account is already active.",
+    # On PostgreSQL a valid request is one statement; anything else falls
+    # through to the lookup, which tells the errors apart.
+    if db.bind.dialect.name == "postgresql" and await activate_user_by_token(
+        db, str(email), token
+    ):
+        await db.commit()
+    else:
+        # Tokens are unique; the user comes with the token (lazy="joined").
+        # Expired tokens are filtered out by the database and purged on a miss.
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(ActivationTokenModel)
+            .options(
+                defaultload(ActivationTokenModel.user).noload(UserModel.rated_movies)
+            )
+            .where(
+                ActivationTokenModel.token == token,
+                ActivationTokenModel.expires_at > now,
+            )
         )
-
-    user.is_active = True
-    await db.delete(token_record)
-    await db.commit()
+        result = await db.execute(stmt)
+        token_record = result.scalars().first()
+
+        if not token_record or token_record.user.email != email:
+            if not token_record:
+                await db.execute(
+                    delete(ActivationTokenModel).where(
+                        ActivationTokenModel.token == token,
+                        ActivationTokenModel.expires_at <= now,
+                    )
+                )
+                await db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired activation token.",
+            )
+
+        user = token_record.user
+        if user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User account is already active.",
+            )
+
+        user.is_active = True
+        await db.delete(token_record)
+        await db.commit()
 
     login_link = "http://127.0.0.1:8000/accounts/login/"
-    await email_sender.send_activation_complete_email(email, login_link)
+    background_tasks.add_task(
+        email_sender.send_activation_complete_email,
+        ActivationCompleteCtx(email, login_link),
+    )
 
     return MessageResponseSchema(message="Account activated. Please log in.")
 
@@ -422,23 +483,29 @@ async def logout_user(
         )
 
     user_id = payload.get("user_id")
-    await db.execute(
-        delete(RefreshTokenModel).where(RefreshTokenModel.user_id == user_id)
-    )
-    await db.commit()
 
-    try:
-        await revoke_token(token, expires_at, redis)
-        # revoked_tokens = await list_revoked_tokens()
-        # print("revoked_tokens_list", revoked_tokens)
-
-        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    async def delete_refresh_tokens() -> None:
+        await db.execute(
+            delete(RefreshTokenModel).where(RefreshTokenModel.user_id == user_id)
+        )
+        await db.commit()
 
-    except Exception:
+    # The database and Redis writes are independent; only this coroutine
+    # touches the session, so both can run at once.
+    deleted, revoked = await asyncio.gather(
+        delete_refresh_tokens(),
+        revoke_token(token, expires_at, redis),
+        return_exceptions=True,
+    )
+    if isinstance(deleted, BaseException):
+        raise deleted
+    if isinstance(revoked, BaseException):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Logout failed"
         )
 
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 
 @router.post(
     "/change-password/",
@@ -475,6 +542,7 @@ async def change_password(
     data: ChangePasswordRequestSchema,
     user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis: aioredis.Redis = Depends(get_redis),
 ) -> MessageResponseSchema:
     """
     Change the password of the currently authenticated user.
@@ -487,6 +555,7 @@ async def change_password(
         data (ChangePasswordRequestSchema): Contains the old and new passwords.
         user (UserModel): The currently authenticated user.
         db (AsyncSession): The asynchronous database session.
+        redis (aioredis.Redis): Redis connection holding the shared user cache.
 
     Returns:
         MessageResponseSchema: Confirmation message indicating successful password update.
@@ -497,14 +566,23 @@ async def change_password(
             - 401 Unauthorized if the user is not authenticated.
     """
 
-    if not user.verify_password(data.old_password):
+    # Cached users don't carry the password hash; read the current one.
+    await db.refresh(user, attribute_names=["_hashed_password"])
+    # Hashing is CPU-bound and runs in a thread on plain values; the user
+    # instance itself is only touched here, on the event loop.
+    if not await asyncio.to_thread(
+        verify_password, data.old_password, user._hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Old password is incorrect.",
         )
 
-    user.password = data.new_password
+    user._hashed_password = await asyncio.to_thread(
+        UserModel.hash_new_password, data.new_password
+    )
     await db.commit()
+    await invalidate_cached_user(user.id, redis)
     return MessageResponseSchema(message="Password updated successfully.")
 
 
@@ -539,6 +617,7 @@ async def change_password(
     },
 )
 async def request_password_reset_token(
+    background_tasks: BackgroundTasks,
     data: PasswordResetRequestSchema,
     db: AsyncSession = Depends(get_db),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
@@ -553,34 +632,30 @@ async def request_password_reset_token(
         data (PasswordResetRequestSchema): The request data containing the user's email.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): The asynchronous email sender.
+        background_tasks (BackgroundTasks): Sends the email after the response.
 
     Returns:
         MessageResponseSchema: A success message indicating that instructions will be sent.
     """
-    stmt = select(UserModel).filter_by(email=data.email)
-    result = await db.execute(stmt)
+    result = await db.execute(_USER_BY_EMAIL, {"email": str(data.email)})
     user = result.scalars().first()
 
     if not user or not user.is_active:
         return MessageResponseSchema(message="A user does not exist or not active.")
 
-    await db.execute(
-        delete(PasswordResetTokenModel).where(
-            PasswordResetTokenModel.user_id == user.id
-        )
+    reset_token = await renew_user_token(
+        db, PasswordResetTokenModel, cast(int, user.id)
     )
-
-    reset_token = PasswordResetTokenModel(user_id=cast(int, user.id))
-    db.add(reset_token)
     await db.commit()
 
     password_reset_complete_link = (
         f"http://127.0.0.1:8000/accounts/password-reset-complete/"
-        f"?token={reset_token.token}&email={data.email}"
+        f"?token={reset_token}&email={data.email}"
     )
 
-    await email_sender.send_password_reset_email(
-        str(data.email), password_reset_complete_link
+    background_tasks.add_task(
+        email_sender.send_password_reset_email,
+        PasswordResetCtx(str(data.email), password_reset_complete_link),
     )
 
     return MessageResponseSchema(
@@ -636,11 +711,13 @@ async def request_password_reset_token(
     },
 )
 async def reset_password(
+    background_tasks: BackgroundTasks,
     token: str = Form(...),
     password: str = Form(...),
     email: EmailStr = Form(...),
     db: AsyncSession = Depends(get_db),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
+    redis: aioredis.Redis = Depends(get_redis),
 ) -> MessageResponseSchema:
     """
     Endpoint for resetting a user's password.
@@ -653,6 +730,8 @@ async def reset_password(
          token, and new password.
         db (AsyncSession): The asynchronous database session.
         email_sender (EmailSenderInterface): The asynchronous email sender.
+        background_tasks (BackgroundTasks): Sends the email after the response.
+        redis (aioredis.Redis): Redis connection holding the shared user cache.
 
     Returns:
         MessageResponseSchema: A response message indicating successful password reset.
@@ -662,40 +741,44 @@ async def reset_password(
             - status.HTTP_400_BAD_REQUEST Bad Request if the email or token is invalid, or the token has expired.
             - 500 Internal Server Error if an error occurs during the password reset process.
     """
-    stmt = select(UserModel).filter_by(email=email)
-    result = await db.execute(stmt)
-    user = result.scalars().first()
+    # Only a matching, unexpired token is joined; anything else is a miss.
+    stmt = (
+        select(UserModel, PasswordResetTokenModel)
+        .outerjoin(
+            PasswordResetTokenModel,
+            and_(
+                PasswordResetTokenModel.user_id == UserModel.id,
+                PasswordResetTokenModel.token == token,
+                PasswordResetTokenModel.expires_at > datetime.now(timezone.utc),
+            ),
+        )
+        .options(noload(UserModel.rated_movies))
+        .where(UserModel.email == email)
+    )
+    row = (await db.execute(stmt)).first()
+    user, token_record = row if row else (None, None)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email or token.",
         )
 
-    stmt = select(PasswordResetTokenModel).filter_by(user_id=user.id)
-    result = await db.execute(stmt)
-    token_record = result.scalars().first()
-
-    if not token_record or token_record.token != token:
-        if token_record:
-            await db.run_sync(lambda s: s.delete(token_record))
-            await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid email or token.",
+    if not token_record:
+        # A wrong or expired token invalidates the user's current one.
+        await db.execute(
+            delete(PasswordResetTokenModel).where(
+                PasswordResetTokenModel.user_id == user.id
+            )
         )
-
-    expires_at = cast(datetime, token_record.expires_at).replace(tzinfo=timezone.utc)
-    if expires_at < datetime.now(timezone.utc):
-        await db.run_sync(lambda s: s.delete(token_record))
         await db.commit()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email or token.",
         )
 
+    hashed_password = await asyncio.to_thread(UserModel.hash_new_password, password)
     try:
-        user.password = password
-        await db.run_sync(lambda s: s.delete(token_record))
+        await reset_password_with_token(db, user.id, token_record.id, hashed_password)
         await db.commit()
     except SQLAlchemyError:
         await db.rollback()
@@ -703,10 +786,14 @@ async def reset_password(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while resetting the password.",
         )
+    await invalidate_cached_user(user.id, redis)
 
     login_link = "http://127.0.0.1:8000/accounts/login/"
 
-    await email_sender.send_password_reset_complete_email(str(email), login_link)
+    background_tasks.add_task(
+        email_sender.send_password_reset_complete_email,
+        PasswordResetCompleteCtx(str(email), login_link),
+    )
 
     return MessageResponseSchema(message="Password reset successfully.")
 
@@ -760,7 +847,7 @@ async def reset_password(
 async def login_user(
     login_data: UserLoginRequestSchema,
     db: AsyncSession = Depends(get_db),
-    settings: BaseAppSettings = Depends(get_settings),
+    settings: BaseAppSettings = Depends(get_app_settings),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
 ) -> UserLoginResponseSchema:
     """
@@ -784,11 +871,12 @@ async def login_user(
             - 403 Forbidden if the user account is not activated.
             - 500 Internal Server Error if an error occurs during token creation.
     """
-    stmt = select(UserModel).filter_by(email=login_data.email)
-    result = await db.execute(stmt)
+    result = await db.execute(_USER_BY_EMAIL, {"email": str(login_data.email)})
     user = result.scalars().first()
 
-    if not user or not user.verify_password(login_data.password):
+    if not user or not await asyncio.to_thread(
+        verify_password, login_data.password, user._hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
@@ -800,20 +888,28 @@ async def login_user(
             detail="User account is not activated.",
         )
 
+    if user.password_needs_rehash():
+        # Upgrade a bcrypt hash; it is committed with the new refresh token.
+        user._hashed_password = await asyncio.to_thread(
+            hash_password, login_data.password
+        )
+
     jwt_refresh_token = jwt_manager.create_refresh_token({"user_id": user.id})
 
     try:
-        await db.execute(
-            delete(RefreshTokenModel).where(RefreshTokenModel.user_id == user.id)
+        stale_tokens = delete(RefreshTokenModel).where(
+            RefreshTokenModel.user_id == user.id
         )
-
-        refresh_token = RefreshTokenModel.create(
+        new_token = insert(RefreshTokenModel).values(
             user_id=user.id,
-            days_valid=settings.LOGIN_TIME_DAYS,
             token=jwt_refresh_token,
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.LOGIN_TIME_DAYS),
         )
-        db.add(refresh_token)
-        await db.flush()
+        # The DELETE must run first: two logins in the same second produce
+        # the same refresh token, which would clash with the unique index.
+        await db.execute(stale_tokens)
+        await db.execute(new_token)
         await db.commit()
     except SQLAlchemyError:
         await db.rollback()
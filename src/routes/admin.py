@@ -1,3 +1,4 @@
+import aioredis
 import stripe
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -26,12 +27,18 @@ from src.schemas import (
     PaymentListSchema,
 )
 from src.config.get_admin import require_admin
-from src.config.get_settings import get_settings
+from src.config.get_current_user import invalidate_cached_user
+from src.tasks.redis_blacklist import get_redis
+from src.config.get_settings import get_app_settings
 from src.config import BaseAppSettings
 from .utils import backfill_all_counters
 
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
 
 
 @router.patch(
@@ -55,7 +62,7 @@ async def change_user_group(
     user_id: int,
     data: UserGroupUpdateSchema,
     db: AsyncSession = Depends(get_db),
-    _: UserModel = Depends(require_admin),
+    redis: aioredis.Redis = Depends(get_redis),
 ) -> dict:
     """
     Change a user's permission group.
@@ -67,6 +74,7 @@ async def change_user_group(
         user_id (int): ID of the user whose group will be updated.
         data (UserGroupUpdateSchema): Target user group.
         db (AsyncSession): Asynchronous database session.
+        redis (aioredis.Redis): Redis connection holding the shared user cache.
 
     Returns:
         dict: Confirmation message indicating the new group.
@@ -89,6 +97,7 @@ async def change_user_group(
         update(UserModel).where(UserModel.id == user_id).values(group_id=group.id)
     )
     await db.commit()
+    await invalidate_cached_user(user_id, redis)
     return {"detail": f"User {user_id} is now {data.group}"}
 
 
@@ -111,7 +120,7 @@ async def activate_user(
     user_id: int,
     data: UserActivateSchema,
     db: AsyncSession = Depends(get_db),
-    _: UserModel = Depends(require_admin),
+    redis: aioredis.Redis = Depends(get_redis),
 ) -> dict:
     """
     Activate or deactivate a user account.
@@ -123,6 +132,7 @@ async def activate_user(
         user_id (int): ID of the user to update.
         data (UserActivateSchema): Activation state payload.
         db (AsyncSession): Asynchronous database session.
+        redis (aioredis.Redis): Redis connection holding the shared user cache.
 
     Returns:
         dict: Confirmation message indicating activation status.
@@ -142,6 +152,7 @@ async def activate_user(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
     await db.commit()
+    await invalidate_cached_user(user_id, redis)
     status_text = "activated" if data.is_active else "deactivated"
     return {"detail": f"User {user_id} has been {status_text}"}
 
@@ -158,7 +169,6 @@ async def activate_user(
     },
 )
 async def recount_all_counters(
-    _: UserModel = Depends(require_admin),
     db: AsyncSession = Depends(get_db),  # ← direct injection, perfect
 ) -> dict:
     """
@@ -199,7 +209,6 @@ async def recount_all_counters(
 )
 async def get_user_cart(
     user_id: int,
-    _: UserModel = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ) -> CartModel:
     """
@@ -253,7 +262,6 @@ async def get_user_cart(
     },
 )
 async def get_all_carts(
-    _: UserModel = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ) -> list[CartModel]:
     """
@@ -300,7 +308,6 @@ async def admin_list_orders(
     status: OrderStatusEnum | None = None,
     date_from: datetime | None = None,
     date_to: datetime | None = None,
-    _: UserModel = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ) -> list[OrderModel]:
     """
@@ -354,7 +361,6 @@ async def admin_list_payments(
     status: PaymentStatusEnum | None = None,
     date_from: datetime | None = None,
     date_to: datetime | None = None,
-    _: UserModel = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ) -> list[PaymentModel]:
     """
@@ -413,9 +419,8 @@ async def admin_list_payments(
 )
 async def refund_payment(
     payment_id: int,
-    settings: BaseAppSettings = Depends(get_settings),
+    settings: BaseAppSettings = Depends(get_app_settings),
     db: AsyncSession = Depends(get_db),
-    _: UserModel = Depends(require_admin),
 ) -> dict:
     """
     Refund a successful payment via Stripe.
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Response
 from typing import Annotated
-from sqlalchemy import select, update, func
+from sqlalchemy import delete, select, update, func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import and_
@@ -10,6 +10,7 @@ from src.database import (
     UserGroupModel,
     UserGroupEnum,
     MovieModel,
+    MovieRatingModel,
     CertificationModel,
     StarModel,
     DirectorModel,
@@ -21,7 +22,6 @@ from src.database import (
     PaymentItemModel,
     PaymentStatusEnum,
     get_db,
-    # get_current_user,
 )
 from src.config.get_current_user import get_current_user
 
@@ -39,7 +39,11 @@ from src.config.get_admin import require_moderator_or_admin
 from .utils import resolve_relations
 
 
-router = APIRouter(prefix="/moderator", tags=["moderator"])
+router = APIRouter(
+    prefix="/moderator",
+    tags=["moderator"],
+    dependencies=[Depends(require_moderator_or_admin)],
+)
 
 
 @router.get(
@@ -76,7 +80,6 @@ router = APIRouter(prefix="/moderator", tags=["moderator"])
 )
 async def list_users(
     db: AsyncSession = Depends(get_db),
-    _: UserModel = Depends(require_moderator_or_admin),
 ) -> list[UserListSchema]:
     """
     Retrieve a list of all users.
@@ -131,7 +134,6 @@ async def list_users(
 async def get_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    _: UserModel = Depends(require_moderator_or_admin),
 ) -> UserDetailSchema:
     """
     Retrieve user details by ID.
@@ -221,7 +223,6 @@ async def get_user(
 )
 async def post_movie(
     movie_data: MovieCreateSchema,
-    _: UserModel = Depends(require_moderator_or_admin),
     db: AsyncSession = Depends(get_db),
 ) -> MovieDetailSchema:
     """
@@ -304,7 +305,17 @@ async def post_movie(
     try:
         db.add(movie)
         await db.commit()
-        await db.refresh(movie, ["genres", "stars", "directors"])
+        movie = await db.scalar(
+            select(MovieModel)
+            .options(
+                joinedload(MovieModel.certification),
+                selectinload(MovieModel.genres),
+                selectinload(MovieModel.stars),
+                selectinload(MovieModel.directors),
+            )
+            .where(MovieModel.id == movie.id)
+            .execution_options(populate_existing=True)
+        )
 
         return MovieDetailSchema.model_validate(movie)
 
@@ -357,7 +368,6 @@ async def post_movie(
 )
 async def delete_movie(
     movie_id: int = Path(..., ge=1, le=9_223_372_036_854_775_807),
-    _: UserModel = Depends(require_moderator_or_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
@@ -380,6 +390,9 @@ async def delete_movie(
         - 403 if the requester lacks sufficient permissions.
     """
 
+    # Link rows are removed by the database (passive_deletes), so no
+    # collections are loaded. Ratings can be numerous and are removed with
+    # one DELETE.
     stmt = select(MovieModel).where(MovieModel.id == movie_id)
     result = await db.execute(stmt)
     movie = result.scalars().first()
@@ -412,6 +425,9 @@ async def delete_movie(
             detail="Can't delete. This movie has been purchased or ordered by users.",
         )
 
+    await db.execute(
+        delete(MovieRatingModel).where(MovieRatingModel.movie_id == movie_id)
+    )
     await db.delete(movie)
     await db.commit()
 
@@ -450,7 +466,6 @@ async def delete_movie(
 async def update_movie(
     movie_data: MovieUpdateSchema,
     movie_id: int = Path(..., ge=1, le=9_223_372_036_854_775_807),
-    _: UserModel = Depends(require_moderator_or_admin),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, str]:
     """
@@ -479,11 +494,11 @@ async def update_movie(
         select(MovieModel)
         .options(
             joinedload(MovieModel.certification),
-            joinedload(MovieModel.genres),
-            joinedload(MovieModel.stars),
-            joinedload(MovieModel.directors),
-            joinedload(MovieModel.favorited_by_users),
-            joinedload(MovieModel.liked_by_users),
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.stars),
+            selectinload(MovieModel.directors),
+            selectinload(MovieModel.favorited_by_users),
+            selectinload(MovieModel.liked_by_users),
         )
         .where(MovieModel.id == movie_id)
     )
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
-from sqlalchemy import select, func, and_, delete, insert
+from sqlalchemy import select, func, and_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload, raiseload, selectinload, defaultload
 from typing import Optional
 
@@ -12,12 +11,11 @@ from src.database import (
     MovieModel,
     UserGroupEnum,
     get_db,
-    # get_current_user,
 )
 from src.config.get_current_user import get_current_user
 from src.schemas.comments import CommentCreateSchema, CommentUpdateSchema, CommentSchema
 
-from ..utils import increment_counter
+from ..utils import increment_counter, upsert
 from src.tasks.comment_notifications import (
     send_comment_reply_email,
     send_comment_like_email,
@@ -108,14 +106,8 @@ async def create_comment(
             status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found"
         )
 
-    comment = MovieCommentModel(
-        movie_id=movie_id,
-        user_id=user.id,
-        content=payload.content.strip(),
-        parent_id=payload.parent_id,
-    )
-    db.add(comment)
-
+    # Look the parent up before adding the comment, so the lookup does not
+    # autoflush a reply to a parent that does not exist.
     if payload.parent_id:
         parent = await db.get(MovieCommentModel, payload.parent_id)
 
@@ -124,6 +116,14 @@ async def create_comment(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid parent comment"
             )
 
+    comment = MovieCommentModel(
+        movie_id=movie_id,
+        user_id=user.id,
+        content=payload.content.strip(),
+        parent_id=payload.parent_id,
+    )
+    db.add(comment)
+
     await db.flush()
     await db.refresh(comment)
 
@@ -534,17 +534,16 @@ async def like_comment(
         )
 
     stmt = (
-        insert(CommentLikeModel).values(user_id=user.id, comment_id=comment_id)
-        # .on_conflict_do_nothing()
+        upsert(db, CommentLikeModel)
+        .values(user_id=user.id, comment_id=comment_id)
+        .on_conflict_do_nothing()
     )
-    try:
-        await db.execute(stmt)
-        await db.commit()
-    except IntegrityError:
+    if not (await db.execute(stmt)).rowcount:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already liked this comment",
         )
+    await db.commit()
 
     send_comment_like_email.delay(
         email=str(comment.user.email),
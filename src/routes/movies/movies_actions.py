@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
-from sqlalchemy import select, func, and_, asc, desc, insert, delete
+from sqlalchemy import select, func, and_, asc, desc, delete
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
@@ -18,14 +18,18 @@ from src.database import (
     UserFavoriteMovieModel,
     MovieLikeModel,
     get_db,
-    # get_current_user,
 )
 
-# from src.database.session_db import get_current_user
 from src.config.get_current_user import get_current_user
 from src.schemas import MovieListResponseSchema, MovieListItemSchema, MovieDetailSchema
 from src.schemas.movies import MovieCreateSchema, MovieUpdateSchema
-from ..utils import SortBy, SortOrder, toggle_movie_reaction, increment_counter
+from ..utils import (
+    SortBy,
+    SortOrder,
+    toggle_movie_reaction,
+    increment_counter,
+    upsert,
+)
 
 
 router = APIRouter(prefix="/movies", tags=["movies"])
@@ -245,21 +249,17 @@ async def add_to_favorites(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Movie with id {movie_id} does not exist.",
         )
-    already_favorited = await db.execute(
-        select(UserFavoriteMovieModel).where(
-            UserFavoriteMovieModel.c.user_id == user.id,
-            UserFavoriteMovieModel.c.movie_id == movie_id,
-        )
+    stmt = (
+        upsert(db, UserFavoriteMovieModel)
+        .values(user_id=user.id, movie_id=movie_id)
+        .on_conflict_do_nothing()
     )
-    if already_favorited.scalar_one_or_none():
+    if not (await db.execute(stmt)).rowcount:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Movie is already in your favorites.",
         )
 
-    stmt = insert(UserFavoriteMovieModel).values(user_id=user.id, movie_id=movie_id)
-    await db.execute(stmt)
-
     await increment_counter(db, movie_id, "favorite_count", +1)
     await db.commit()
 
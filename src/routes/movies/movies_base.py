@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select, func, and_, asc, desc
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from typing import Optional
 
 
@@ -364,11 +364,9 @@ async def get_movie_by_id(
         )
         .options(
             joinedload(MovieModel.certification),
-            joinedload(MovieModel.genres),
-            joinedload(MovieModel.stars),
-            joinedload(MovieModel.directors),
-            joinedload(MovieModel.favorited_by_users),
-            joinedload(MovieModel.liked_by_users),
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.stars),
+            selectinload(MovieModel.directors),
         )
         .where(MovieModel.id == movie_id)
     )
@@ -6,7 +6,6 @@ from src.database import (
     MovieRatingModel,
     MovieModel,
     get_db,
-    # get_current_user,
     UserModel,
 )
 from src.config.get_current_user import get_current_user
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import select, delete, exists
-from src.config.get_settings import get_settings
+from src.config.get_settings import get_app_settings
 from src.database import (
     get_db,
     CartModel,
@@ -32,7 +32,7 @@ from src.schemas import (
     PaymentListSchema,
     PaymentResponseSchema,
 )
-from src.notifications import EmailSenderInterface
+from src.notifications import EmailSenderInterface, PaymentCtx
 
 from .utils import delete_paid_items_for_user
 
@@ -79,7 +79,7 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 async def create_payment(
     order_id: int,
     user: UserModel = Depends(get_current_user),
-    settings: BaseAppSettings = Depends(get_settings),
+    settings: BaseAppSettings = Depends(get_app_settings),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, str]:
     """
@@ -166,7 +166,7 @@ async def create_payment(
 )
 async def stripe_webhook(
     request: Request,
-    settings: BaseAppSettings = Depends(get_settings),
+    settings: BaseAppSettings = Depends(get_app_settings),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, str]:
@@ -253,8 +253,8 @@ async def stripe_webhook(
 
         header = "Payment succeeded"
         message = (
-            f"Your payment for the order {order_id} is successful.<br />"
-            f"Payment id: {intent['id']}<br />"
+            f"Your payment for the order {order_id} is successful.\n"
+            f"Payment id: {intent['id']}\n"
             f"Amount: {intent['amount'] / 100}"
         )
         user = await db.get(UserModel, user_id)
@@ -267,7 +267,7 @@ async def stripe_webhook(
 
         header = "Payment failed"
         message = (
-            f"Your payment of ${amount} for order {order_id} failed.<br />"
+            f"Your payment of ${amount} for order {order_id} failed.\n"
             f"Reason: {intent['last_payment_error']['message']}"
         )
 
@@ -276,7 +276,9 @@ async def stripe_webhook(
     else:
         return {"status": "ignored"}
 
-    await email_sender.send_payment_email(user.email, header, message)
+    await email_sender.send_payment_email(
+        PaymentCtx(user.email, header, message)
+    )
     return {"status": "ok"}
 
 
@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
 from enum import Enum
 from typing import TypeVar, Type, Sequence
 from fastapi import HTTPException
 
-from sqlalchemy import delete, insert, update, select, func
+from sqlalchemy import Table, delete, update, select, func
+from sqlalchemy.dialects.postgresql import Insert as PGInsert, insert as pg_insert
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert, insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -18,6 +22,9 @@ from src.database import (
     PaymentStatusEnum,
     PaymentModel,
     PaymentItemModel,
+    ActivationTokenModel,
+    PasswordResetTokenModel,
+    UserModel,
 )
 
 
@@ -49,54 +56,157 @@ async def increment_counter(
     )
 
 
-async def toggle_movie_reaction(
+def upsert(db: AsyncSession, table: Table) -> PGInsert | SQLiteInsert:
+    """
+    Return a dialect-specific INSERT for `table` supporting ON CONFLICT clauses.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
+
+async def renew_user_token(
     db: AsyncSession,
+    model: Type[ActivationTokenModel] | Type[PasswordResetTokenModel],
     user_id: int,
-    movie_id: int,
-    is_like: bool,
-) -> None:
-    """Create or update a user's like/dislike reaction for a movie."""
+) -> str:
+    """
+    Replace the user's token in `model` with a fresh one and return it.
+
+    The tables allow one token per user, so this is a single upsert on
+    `user_id`; the new token and expiry come from the column defaults.
+    """
+    stmt = upsert(db, model.__table__).values(user_id=user_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "token": stmt.excluded.token,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    ).returning(model.token)
+    return (await db.execute(stmt)).scalar_one()
+
+
+async def activate_user_by_token(db: AsyncSession, email: str, token: str) -> bool:
+    """
+    Activate the inactive user `email` and consume their activation `token`.
 
-    # 1. Get current reaction (if any)
-    current = await db.scalar(
-        select(MovieLikeModel.c.like).where(
-            MovieLikeModel.c.user_id == user_id, MovieLikeModel.c.movie_id == movie_id
+    PostgreSQL only: one statement,
+    WITH used_token AS (DELETE ... RETURNING user_id) UPDATE users ...
+    Nothing is changed unless the token is valid, unexpired and belongs to
+    an inactive user with this email.
+
+    Returns:
+        bool: Whether the user was activated.
+    """
+    used_token = (
+        delete(ActivationTokenModel)
+        .where(
+            ActivationTokenModel.user_id == UserModel.id,
+            ActivationTokenModel.token == token,
+            ActivationTokenModel.expires_at > datetime.now(timezone.utc),
+            UserModel.email == email,
+            UserModel.is_active.is_(False),
         )
+        .returning(ActivationTokenModel.user_id)
+        .cte("used_token")
+    )
+    stmt = (
+        update(UserModel)
+        .where(UserModel.id.in_(select(used_token.c.user_id)))
+        .values(is_active=True)
+        .returning(UserModel.id)
+        .add_cte(used_token)
+        .execution_options(synchronize_session=False)
     )
+    return (await db.execute(stmt)).scalar() is not None
 
-    delta = 0
 
-    if current is None:
-        # No reaction → new one
-        if is_like:
-            delta = +1
-        # if dislike → delta stays 0 (we don't count dislikes)
+async def reset_password_with_token(
+    db: AsyncSession, user_id: int, token_id: int, hashed_password: str
+) -> None:
+    """
+    Set the user's password hash and delete their used reset token.
 
-        await db.execute(
-            insert(MovieLikeModel).values(
-                user_id=user_id, movie_id=movie_id, like=is_like
-            )
-        )
+    On PostgreSQL this is one statement,
+    WITH used_token AS (DELETE ...) UPDATE users ...
+    elsewhere the two statements run one after the other.
+    """
+    set_password = (
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values({UserModel._hashed_password: hashed_password})
+    )
+    used_token = delete(PasswordResetTokenModel).where(
+        PasswordResetTokenModel.id == token_id
+    )
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(set_password.add_cte(used_token.cte("used_token")))
+    else:
+        await db.execute(used_token)
+        await db.execute(set_password)
 
-    elif current != is_like:
-        # Switching reaction
-        if current is True and not is_like:
-            delta = -1  # Was like → now dislike → remove from count
-        elif not current and is_like:
-            delta = +1  # Was dislike → now like → add to count
 
-        await db.execute(
+def is_unique_violation(error: IntegrityError) -> bool:
+    """
+    Tell whether `error` was raised by a UNIQUE constraint (SQLSTATE 23505).
+    """
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(
+        error.orig, "pgcode", None
+    )
+    if sqlstate is not None:
+        return sqlstate == "23505"
+    return "UNIQUE constraint failed" in str(error.orig)
+
+
+async def toggle_movie_reaction(
+    db: AsyncSession,
+    user_id: int,
+    movie_id: int,
+    is_like: bool,
+) -> None:
+    """Create or update a user's like/dislike reaction for a movie."""
+
+    # Each branch is a single conditional write, so concurrent toggles can't
+    # race between reading the current reaction and writing the new one.
+    if is_like:
+        # New like or dislike → like: both add one to like_count.
+        stmt = upsert(db, MovieLikeModel).values(
+            user_id=user_id, movie_id=movie_id, like=True
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "movie_id"],
+            set_={"like": stmt.excluded.like},
+            where=MovieLikeModel.c.like != stmt.excluded.like,
+        )
+        if not (await db.execute(stmt)).rowcount:
+            return
+        delta = +1
+    else:
+        # Was like → now dislike → remove from count
+        switched = await db.execute(
             update(MovieLikeModel)
             .where(
                 MovieLikeModel.c.user_id == user_id,
                 MovieLikeModel.c.movie_id == movie_id,
+                MovieLikeModel.c.like.is_(True),
             )
-            .values(like=is_like)
+            .values(like=False)
         )
-    else:
-        return
+        if switched.rowcount:
+            delta = -1
+        else:
+            # No reaction → new dislike; we don't count dislikes
+            stmt = (
+                upsert(db, MovieLikeModel)
+                .values(user_id=user_id, movie_id=movie_id, like=False)
+                .on_conflict_do_nothing()
+            )
+            if not (await db.execute(stmt)).rowcount:
+                return
+            delta = 0
 
-    # 2. Only update counter if it actually affects like_count
+    # Only update counter if it actually affects like_count
     if delta != 0:
         await increment_counter(db, movie_id, "like_count", delta)
 
@@ -108,70 +218,54 @@ async def backfill_all_counters(db: AsyncSession) -> None:
 
     print("Starting backfill using pure SQLAlchemy...")
 
-    # 1. Reset all counters to 0 (safety)
-    await db.execute(
-        update(MovieModel).values(
-            like_count=0,
-            favorite_count=0,
-            comment_count=0,
-            rating_count=0,
-            rating_average=0.0,
+    # One set-based UPDATE: every counter is a correlated aggregate over its
+    # relation, so the whole table is recounted in a single statement instead
+    # of several queries per movie.
+    like_count = (
+        select(func.count())
+        .select_from(MovieLikeModel)
+        .where(
+            MovieLikeModel.c.movie_id == MovieModel.id,
+            MovieLikeModel.c.like.is_(True),
         )
+        .scalar_subquery()
+    )
+    favorite_count = (
+        select(func.count())
+        .select_from(UserFavoriteMovieModel)
+        .where(UserFavoriteMovieModel.c.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+    comment_count = (
+        select(func.count())
+        .select_from(MovieCommentModel)
+        .where(MovieCommentModel.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+    rating_count = (
+        select(func.count())
+        .select_from(MovieRatingModel)
+        .where(MovieRatingModel.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+    rating_average = (
+        select(func.coalesce(func.round(func.avg(MovieRatingModel.rating), 2), 0.0))
+        .where(MovieRatingModel.movie_id == MovieModel.id)
+        .scalar_subquery()
     )
 
-    # 2. Re-count everything using SQLAlchemy only
-    movies = await db.execute(select(MovieModel.id))
-    movie_ids = [row[0] for row in movies.fetchall()]
-
-    for movie_id in movie_ids:
-        # Like count
-        like_cnt = await db.scalar(
-            select(func.count())
-            .select_from(MovieLikeModel)
-            .where(
-                MovieLikeModel.c.movie_id == movie_id, MovieLikeModel.c.like.is_(True)
-            )
-        )
-
-        # Favorite count
-        fav_cnt = await db.scalar(
-            select(func.count())
-            .select_from(UserFavoriteMovieModel)
-            .where(UserFavoriteMovieModel.c.movie_id == movie_id)
-        )
-
-        # Comment count
-        comment_cnt = await db.scalar(
-            select(func.count())
-            .select_from(MovieCommentModel)
-            .where(MovieCommentModel.movie_id == movie_id)
-        )
-
-        # Rating count + average
-        rating_stats = await db.execute(
-            select(func.count(), func.avg(MovieRatingModel.rating)).where(
-                MovieRatingModel.movie_id == movie_id
-            )
-        )
-        rating_count, rating_avg = rating_stats.first()
-        rating_count = rating_count or 0
-        rating_avg = round(float(rating_avg or 0.0), 2)
-
-        # Update movie with correct values
-        await db.execute(
-            update(MovieModel)
-            .where(MovieModel.id == movie_id)
-            .values(
-                like_count=like_cnt or 0,
-                favorite_count=fav_cnt or 0,
-                comment_count=comment_cnt or 0,
-                rating_count=rating_count,
-                rating_average=rating_avg,
-            )
+    result = await db.execute(
+        update(MovieModel).values(
+            like_count=like_count,
+            favorite_count=favorite_count,
+            comment_count=comment_count,
+            rating_count=rating_count,
+            rating_average=rating_average,
         )
+    )
 
     await db.commit()
-    print(f"Backfilled {len(movie_ids)} movies using pure SQLAlchemy!")
+    print(f"Backfilled {result.rowcount} movies using pure SQLAlchemy!")
 
 
 async def update_movie_rating_stats(
@@ -0,0 +1,57 @@
+import math
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over short byte keys (e.g. blake2b digests).
+
+    Membership tests may return false positives, never false negatives. The
+    keys are expected to be uniformly distributed already, so the bit indexes
+    are derived from the key bytes directly by double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity (int): Number of keys the filter is sized for.
+            error_rate (float): Target false-positive rate at `capacity` keys.
+        """
+        self.capacity = capacity
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, key: bytes) -> list[int]:
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        return [(h1 + i * h2) % self._size for i in range(self._hashes)]
+
+    def add(self, key: bytes) -> None:
+        """
+        Add `key` to the filter.
+        """
+        added = False
+        for index in self._indexes(key):
+            byte, bit = divmod(index, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+
+    def clear(self) -> None:
+        """
+        Remove all keys from the filter.
+        """
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def __contains__(self, key: bytes) -> bool:
+        for index in self._indexes(key):
+            byte, bit = divmod(index, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
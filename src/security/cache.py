@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A small in-process mapping whose entries expire after a time-to-live.
+
+    Entries are kept in insertion order; once `maxsize` is reached the oldest
+    entry is evicted. The cache is meant to be used from a single event loop
+    and performs no locking.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept at once.
+            ttl (float): Default lifetime of an entry, in seconds.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored under `key`, or `default` if it is missing or expired.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` under `key` for `ttl` seconds (the cache default if omitted).
+        """
+        ttl = self._ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data.pop(key, None)
+        while len(self._data) >= self._maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove `key` from the cache and return its value, or `default` if absent.
+        """
+        item = self._data.pop(key, None)
+        if item is None or item[0] <= time.monotonic():
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
@@ -1,4 +1,7 @@
+from typing import Any, Callable, Optional
+
 from fastapi import Request, HTTPException, status, Depends
+from fastapi.routing import APIRoute
 
 
 # src/security/http.py
@@ -7,6 +10,53 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+_BEARER_PREFIX = "bearer "
+
+
+def get_bearer_token(request: Request) -> Optional[str]:
+    """
+    Return the token from an `Authorization: Bearer <token>` header, if any.
+
+    This is what `bearer_scheme` does, without going through a separate
+    dependency; any other scheme or an empty token yields None.
+    """
+    authorization = request.headers.get("authorization")
+    if not authorization or authorization[:7].lower() != _BEARER_PREFIX:
+        return None
+    return authorization[7:].strip() or None
+
+
+def _depends_on(dependant: Any, dependency: Callable) -> bool:
+    return any(
+        sub.call is dependency or _depends_on(sub, dependency)
+        for sub in dependant.dependencies
+    )
+
+
+def add_bearer_security(schema: dict, routes: list, dependency: Callable) -> dict:
+    """
+    Mark every operation that depends on `dependency` as bearer-protected.
+
+    Dependencies that read the header themselves (see `get_bearer_token`) are
+    invisible to FastAPI's OpenAPI generator, so the HTTPBearer security
+    requirement is added to the generated schema here instead.
+    """
+    schema.setdefault("components", {}).setdefault("securitySchemes", {})[
+        "HTTPBearer"
+    ] = {"type": "http", "scheme": "bearer"}
+
+    paths = schema.get("paths", {})
+    for route in routes:
+        if not isinstance(route, APIRoute) or not _depends_on(
+            route.dependant, dependency
+        ):
+            continue
+        for method in route.methods:
+            operation = paths.get(route.path_format, {}).get(method.lower())
+            if operation is not None:
+                operation["security"] = [{"HTTPBearer": []}]
+    return schema
+
 
 def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
@@ -1,14 +1,23 @@
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=14, deprecated="auto")
+# New hashes use argon2id (~50 ms); bcrypt hashes of existing users still
+# verify and are upgraded on their next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=2,
+    bcrypt__rounds=14,
+)
 
 
 def hash_password(password: str) -> str:
     """
     Hash a plain-text password using the configured password context.
 
-    This function takes a plain-text password and returns its bcrypt hash.
-    The bcrypt algorithm is used with a specified number of rounds for enhanced security.
+    This function takes a plain-text password and returns its argon2id hash.
 
     Args:
         password (str): The plain-text password to hash.
@@ -34,3 +43,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if the password is correct, False otherwise.
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash uses a deprecated scheme or outdated parameters.
+
+    Args:
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if the password should be hashed again.
+    """
+    return pwd_context.needs_update(hashed_password)
@@ -15,6 +15,10 @@ class JWTAuthManager(JWTAuthManagerInterface):
     _ACCESS_KEY_TIMEDELTA_MINUTES = 60 * 24 * 7
     _REFRESH_KEY_TIMEDELTA_MINUTES = 60 * 24 * 7
 
+    # Tokens issued here are a few hundred bytes; anything much larger is
+    # rejected before any Base64/JSON decoding is attempted.
+    MAX_TOKEN_LENGTH = 4096
+
     def __init__(
         self, secret_key_access: str, secret_key_refresh: str, algorithm: str
     ) -> None:
@@ -64,6 +68,8 @@ class JWTAuthManager(JWTAuthManagerInterface):
         """
         Decode and validate an access token, returning the token's data.
         """
+        if len(token) > self.MAX_TOKEN_LENGTH:
+            raise InvalidTokenError
         try:
             return jwt.decode(
                 token, self._secret_key_access, algorithms=[self._algorithm]
@@ -77,6 +83,8 @@ class JWTAuthManager(JWTAuthManagerInterface):
         """
         Decode and validate a refresh token, returning the token's data.
         """
+        if len(token) > self.MAX_TOKEN_LENGTH:
+            raise InvalidTokenError
         try:
             return jwt.decode(
                 token, self._secret_key_refresh, algorithms=[self._algorithm]
@@ -26,3 +26,11 @@ class S3StorageInterface(ABC):
         :return: The full URL to access the file.
         """
         pass
+
+    async def aclose(self) -> None:
+        """
+        Release any network resources held by the storage client.
+
+        The default implementation holds nothing and does nothing.
+        """
+        pass
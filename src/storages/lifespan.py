@@ -1,5 +1,18 @@
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
+from src.config.dependencies import (
+    get_accounts_email_notificator,
+    get_s3_storage_client,
+)
+from src.config.get_current_user import load_user_groups
+from src.config.get_settings import get_settings
+from src.database import get_db_contextmanager
+from src.database.session_db import warm_up_pool
 from src.storages import create_bucket_if_not_exists
+from src.tasks.redis_blacklist import listen_for_revocations
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -8,5 +21,20 @@ from typing import AsyncGenerator
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await create_bucket_if_not_exists()
     print("Bucket ensured. App starting...")
+    # Warm-up only: groups are loaded on first use if the tables aren't there yet.
+    with contextlib.suppress(SQLAlchemyError, OSError):
+        await warm_up_pool()
+    with contextlib.suppress(SQLAlchemyError):
+        async with get_db_contextmanager() as db:
+            await load_user_groups(db)
+    email_sender = await get_accounts_email_notificator(get_settings())
+    await email_sender.warmup()
+    revocation_listener = asyncio.create_task(listen_for_revocations())
     yield
+    revocation_listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await revocation_listener
+    s3_storage_client = await get_s3_storage_client(get_settings())
+    await s3_storage_client.aclose()
+    await email_sender.close()
     print("App shutting down...")
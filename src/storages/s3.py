@@ -1,6 +1,9 @@
-from typing import Union
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, Optional, Union
 
 import aioboto3
+from aiobotocore.config import AioConfig
 from botocore.exceptions import (
     BotoCoreError,
     NoCredentialsError,
@@ -35,6 +38,42 @@ class S3StorageClient(S3StorageInterface):
             aws_access_key_id=self._access_key,
             aws_secret_access_key=self._secret_key,
         )
+        self._client: Optional[Any] = None
+        self._client_stack: Optional[AsyncExitStack] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+
+    async def _get_client(self) -> Any:
+        """
+        Return the long-lived S3 client, creating it on first use.
+
+        The client keeps its HTTP connections alive, so uploads after the first
+        one skip the TCP/TLS handshake and botocore's client construction.
+        """
+        if self._client is not None:
+            return self._client
+
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        async with self._client_lock:
+            if self._client is None:
+                stack = AsyncExitStack()
+                self._client = await stack.enter_async_context(
+                    self._session.client(
+                        "s3",
+                        endpoint_url=self._endpoint_url,
+                        config=AioConfig(max_pool_connections=50, tcp_keepalive=True),
+                    )
+                )
+                self._client_stack = stack
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying S3 client and its connection pool.
+        """
+        if self._client_stack is not None:
+            stack, self._client_stack, self._client = self._client_stack, None, None
+            await stack.aclose()
 
     async def upload_file(
         self, file_name: str, file_data: Union[bytes, bytearray]
@@ -51,15 +90,13 @@ class S3StorageClient(S3StorageInterface):
             S3FileUploadError: If the file upload fails due to a BotoCore error.
         """
         try:
-            async with self._session.client(
-                "s3", endpoint_url=self._endpoint_url
-            ) as client:
-                await client.put_object(
-                    Bucket=self._bucket_name,
-                    Key=file_name,
-                    Body=file_data,
-                    ContentType="image/jpeg",
-                )
+            client = await self._get_client()
+            await client.put_object(
+                Bucket=self._bucket_name,
+                Key=file_name,
+                Body=file_data,
+                ContentType="image/jpeg",
+            )
         except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
             raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
         except BotoCoreError as e:
@@ -2,12 +2,12 @@ from datetime import datetime, timezone
 from sqlalchemy import delete
 from sqlalchemy.orm import sessionmaker
 from src.database.models.accounts import ActivationTokenModel, PasswordResetTokenModel
-from src.database.session_db import sync_engine
+from src.database.session_db import get_sync_engine
 from src.tasks.celery_app import celery_app
 from typing import cast
 
 
-SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 
 @celery_app.task(name="src.tasks.cleanup.cleanup_expired_tokens")
@@ -16,7 +16,7 @@ def cleanup_expired_tokens() -> None:
 
     now = datetime.now(timezone.utc)
 
-    with SessionLocal() as session:
+    with SessionLocal(bind=get_sync_engine()) as session:
         session.execute(
             delete(ActivationTokenModel).where(ActivationTokenModel.expires_at < now)
         )
@@ -10,6 +10,7 @@ from src.tasks.celery_app import celery_app
 
 from src.config.get_settings import get_settings  # ← direct import
 from src.notifications import EmailSender  # ← the real class
+from src.notifications import CommentReplyCtx, CommentLikeCtx
 from typing import TypeVar, Awaitable
 
 T = TypeVar("T")
@@ -27,6 +28,14 @@ def run_async(coro: Awaitable[T]) -> T:
         asyncio.set_event_loop(None)
 
 
+async def send_and_close(email_sender: EmailSender, send: Awaitable[None]) -> None:
+    """Await `send`, then flush and close the per-task sender."""
+    try:
+        await send
+    finally:
+        await email_sender.close()
+
+
 def get_accounts_email_notificator_celery() -> EmailSender:
     settings = get_settings()
 
@@ -66,8 +75,11 @@ def send_comment_reply_email(
         email_sender = get_accounts_email_notificator_celery()
 
         run_async(
-            email_sender.send_comment_reply_email(
-                email, parent_preview, current_preview, reply_link
+            send_and_close(
+                email_sender,
+                email_sender.send_comment_reply_email(
+                    CommentReplyCtx(email, parent_preview, current_preview, reply_link)
+                ),
             )
         )
 
@@ -95,7 +107,12 @@ def send_comment_like_email(
         email_sender = get_accounts_email_notificator_celery()
 
         run_async(
-            email_sender.send_comment_like_email(email, parent_preview, comment_link)
+            send_and_close(
+                email_sender,
+                email_sender.send_comment_like_email(
+                    CommentLikeCtx(email, parent_preview, comment_link)
+                ),
+            )
         )
 
         logger.info(f"Like email sent to {email}")
@@ -1,22 +1,104 @@
 # src/redis.py
+import asyncio
+import logging
+import time
+from hashlib import blake2b
+
 from fastapi import Depends
 import aioredis
 from datetime import datetime, timezone
 from src.config.get_settings import get_settings
+from src.security.bloom import BloomFilter
+from src.security.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Carries revoked token digests (hex) and, prefixed with USER_MESSAGE_PREFIX,
+# the ids of users whose cached copies every worker must drop.
+REVOCATION_CHANNEL = "revoked-tokens"
+USER_MESSAGE_PREFIX = "user:"
+REDIS_MAX_CONNECTIONS = 64
+
+# The listener pings the channel after this many seconds without a message,
+# and stops trusting the revocation filter once it has heard nothing at all
+# (not even a pong) for SILENCE_LIMIT seconds.
+LISTENER_PING_INTERVAL = 5
+LISTENER_SILENCE_LIMIT = 3 * LISTENER_PING_INTERVAL
+LISTENER_MAX_RETRY_DELAY = 30
+
+REVOKED_FILTER_CAPACITY = 100_000
+REVOKED_FILTER_ERROR_RATE = 0.001
 
 _redis: aioredis.Redis | None = None
 
+# Tokens recently confirmed as NOT revoked. Kept well under the access token
+# lifetime; entries are evicted on logout and on revocation events published
+# by other workers.
+_not_revoked_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Digests of every revoked, not yet expired token. Only trusted while the
+# revocation listener keeps it in sync with Redis; a miss then proves that the
+# token is not revoked without a Redis round trip.
+_revoked_filter = BloomFilter(REVOKED_FILTER_CAPACITY, REVOKED_FILTER_ERROR_RATE)
+_revoked_filter_ready = False
+_revoked_filter_heard_at = 0.0
+
+# Per-token caches (keyed by `token_cache_key`) to evict on revocation.
+_revocation_caches: list[TTLCache] = [_not_revoked_cache]
+
+# Per-user caches (keyed by user id) to evict on user invalidation.
+_user_caches: list[TTLCache] = []
+
+
+def token_cache_key(token: str) -> bytes:
+    """Return a short, fixed-size digest of a token for use as a cache key."""
+    return blake2b(token.encode(), digest_size=16).digest()
+
+
+def _revoked_key(cache_key: bytes) -> str:
+    # Blacklist entries are keyed by the token digest (32 hex characters)
+    # rather than by the token itself, which is several hundred bytes.
+    return f"revoked:{cache_key.hex()}"
+
+
+def evict_on_revocation(cache: TTLCache) -> None:
+    """Drop a token's entry from `cache` whenever that token is revoked."""
+    _revocation_caches.append(cache)
+
+
+def _evict_revoked(cache_key: bytes) -> None:
+    for cache in _revocation_caches:
+        cache.pop(cache_key)
+
+
+def evict_on_user_invalidation(cache: TTLCache) -> None:
+    """Drop a user's entry from `cache` whenever any worker invalidates it."""
+    _user_caches.append(cache)
+
+
+def user_invalidation_message(user_id: int) -> str:
+    """Return the message that makes every listener evict `user_id`."""
+    return f"{USER_MESSAGE_PREFIX}{user_id}"
+
 
 async def get_redis() -> aioredis.Redis:
-    """Get shared Redis connection (lazy init)."""
+    """
+    Get the shared Redis client (lazy init).
+
+    The client is created once per process on top of an explicit, bounded
+    connection pool; every caller reuses it and only checks out a connection
+    for the duration of a command.
+    """
     global _redis
     settings = get_settings()
     if _redis is None:
-        _redis = aioredis.from_url(
+        pool = aioredis.ConnectionPool.from_url(
             settings.CELERY_BROKER_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
             decode_responses=True,
             encoding="utf-8",
         )
+        _redis = aioredis.Redis(connection_pool=pool)
         # Optional: test connection
         try:
             await _redis.ping()
@@ -33,8 +115,15 @@ async def revoke_token(token: str, expires_at: datetime, redis: aioredis.Redis)
     if ttl <= 0:
         return
 
+    cache_key = token_cache_key(token)
+    _evict_revoked(cache_key)
+    _revoked_filter.add(cache_key)
+
     try:
-        await redis.set(f"revoked:{token}", "1", ex=ttl)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(_revoked_key(cache_key), "1", ex=ttl)
+            pipe.publish(REVOCATION_CHANNEL, cache_key.hex())
+            await pipe.execute()
     except aioredis.ConnectionError:
         # Log, but don't crash
         pass
@@ -43,21 +132,135 @@ async def revoke_token(token: str, expires_at: datetime, redis: aioredis.Redis)
 async def is_token_revoked(token: str, redis: aioredis.Redis) -> bool:
     """
     Check if token is blacklisted.
+
+    Tokens missing from the synced revocation filter, and negative answers
+    cached in-process for a short time, skip the Redis round trip.
     """
+    cache_key = token_cache_key(token)
+    if _revoked_filter_in_sync() and cache_key not in _revoked_filter:
+        return False
+    if cache_key in _not_revoked_cache:
+        return False
+
     try:
-        return await redis.get(f"revoked:{token}") is not None
+        # Entries written before the switch to digest keys are still keyed by
+        # the full token; checking both costs no extra round trip.
+        revoked = bool(
+            await redis.exists(_revoked_key(cache_key), f"revoked:{token}")
+        )
     except aioredis.RedisError:
         # Fail open? Or fail closed?
         # For security: assume NOT revoked if Redis down
         return False
 
+    if not revoked:
+        _not_revoked_cache.set(cache_key, True)
+    return revoked
+
+
+def _revoked_filter_in_sync() -> bool:
+    return (
+        _revoked_filter_ready
+        and time.monotonic() - _revoked_filter_heard_at < LISTENER_SILENCE_LIMIT
+    )
+
+
+async def _load_revoked_filter(redis: aioredis.Redis) -> BloomFilter:
+    keys = [key async for key in redis.scan_iter(match="revoked:*", count=1000)]
+    # Leave room for the revocations that arrive until the next rebuild.
+    revoked_filter = BloomFilter(
+        max(REVOKED_FILTER_CAPACITY, 2 * len(keys)), REVOKED_FILTER_ERROR_RATE
+    )
+    for key in keys:
+        suffix = key.split(":", 1)[1]
+        try:
+            revoked_filter.add(bytes.fromhex(suffix))
+        except ValueError:
+            # A full token, revoked before entries were keyed by digest.
+            revoked_filter.add(token_cache_key(suffix))
+    return revoked_filter
+
+
+def _on_message(data: str) -> None:
+    try:
+        if data.startswith(USER_MESSAGE_PREFIX):
+            user_id = int(data[len(USER_MESSAGE_PREFIX) :])
+            for cache in _user_caches:
+                cache.pop(user_id)
+            return
+        cache_key = bytes.fromhex(data)
+    except ValueError:
+        logger.warning("Ignoring malformed revocation message: %r", data)
+        return
+    _evict_revoked(cache_key)
+    _revoked_filter.add(cache_key)
+
+
+async def _follow_revocations() -> None:
+    global _revoked_filter, _revoked_filter_ready, _revoked_filter_heard_at
+    redis = await get_redis()
+    pubsub = redis.pubsub()
+    try:
+        # Subscribe before loading, so no revocation falls between the two.
+        await pubsub.subscribe(REVOCATION_CHANNEL)
+        _revoked_filter = await _load_revoked_filter(redis)
+        _revoked_filter_heard_at = time.monotonic()
+        _revoked_filter_ready = True
+        while True:
+            message = await pubsub.get_message(timeout=LISTENER_PING_INTERVAL)
+            if message is None:
+                if time.monotonic() - _revoked_filter_heard_at > LISTENER_SILENCE_LIMIT:
+                    raise aioredis.ConnectionError("revocation channel went silent")
+                await pubsub.ping()
+                continue
+            _revoked_filter_heard_at = time.monotonic()
+            if message["type"] != "message":
+                continue
+            _on_message(message["data"])
+            if _revoked_filter.count > _revoked_filter.capacity:
+                # Expired revocations are never removed from the filter;
+                # rebuild it from the live keys once it is over capacity.
+                # The old filter stays in use (a superset) until then.
+                _revoked_filter = await _load_revoked_filter(redis)
+    finally:
+        await pubsub.close()
+
+
+async def listen_for_revocations() -> None:
+    """
+    Keep the local revocation state in sync with revocations on any worker.
+
+    Loads the revocation filter from Redis, then evicts cached results and
+    extends the filter for every published revocation, and evicts cached
+    users for every published user invalidation. The filter is only
+    trusted while the subscription is alive; on errors or silence the
+    listener reconnects with a growing delay. Runs until cancelled; meant to
+    be started as a background task on startup.
+    """
+    global _revoked_filter_ready
+    delay = 1
+    while True:
+        try:
+            await _follow_revocations()
+        except (aioredis.RedisError, RuntimeError, OSError) as e:
+            logger.warning(
+                "Token revocation listener failed, retrying in %ss: %s", delay, e
+            )
+        finally:
+            subscribed = _revoked_filter_ready
+            _revoked_filter_ready = False
+        await asyncio.sleep(delay)
+        delay = 1 if subscribed else min(2 * delay, LISTENER_MAX_RETRY_DELAY)
+
 
 # ——— Admin / Debug Only ———
 async def list_revoked_tokens(redis: aioredis.Redis = Depends(get_redis)) -> list:
     """For debugging only."""
     try:
-        keys = await redis.keys("revoked:*")
-        return [key.split(":", 1)[1] for key in keys]
+        return [
+            key.split(":", 1)[1]
+            async for key in redis.scan_iter(match="revoked:*", count=1000)
+        ]
     except aioredis.RedisError as e:
-        print(f"Redis error in list_revoked_tokens: {e}")
+        logger.warning("Redis error in list_revoked_tokens: %s", e)
         return []
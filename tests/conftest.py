@@ -27,6 +27,7 @@ from src.database import (
     UserGroupModel,
 )
 from src.config.get_settings import get_settings
+from src.config.get_current_user import clear_user_cache
 
 # from src.database.populate import CSVDatabaseSeeder
 from src.main import app
@@ -51,6 +52,7 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "e2e: End-to-end tests")
     config.addinivalue_line("markers", "order: Specify the order of test execution")
     config.addinivalue_line("markers", "unit: Unit tests")
+    config.addinivalue_line("markers", "no_seed: Skip seeding the test database")
 
 
 from src.database.populate_db import (
@@ -79,6 +81,7 @@ async def reset_db(request):
         yield
     else:
         await reset_database()
+        clear_user_cache()
         yield
 
 
@@ -110,9 +113,12 @@ async def settings():
     """
     Provide application settings.
 
-    This fixture returns the application settings by calling get_settings().
+    This fixture rebuilds the application settings from the current
+    environment with get_settings(), and drops the cached copy afterwards.
     """
-    return get_settings()
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
 
 
 @pytest_asyncio.fixture(scope="function")
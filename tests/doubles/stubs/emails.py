@@ -1,59 +1,7 @@
-from src.notifications import EmailSenderInterface
+from src.notifications.sinks import NullEmailSender
 
 
-class StubEmailSender(EmailSenderInterface):
-
-    async def send_activation_email(self, email: str, activation_link: str) -> None:
-        """
-        Stub implementation for sending an activation email.
-
-        Args:
-            email (str): The recipient's email address.
-            activation_link (str): The activation link to include in the email.
-        """
-        return None
-
-    async def send_activation_complete_email(self, email: str, login_link: str) -> None:
-        """
-        Stub implementation for sending an account activation complete email.
-
-        Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to include in the email.
-        """
-        return None
-
-    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
-        """
-        Stub implementation for sending a password reset email.
-
-        Args:
-            email (str): The recipient's email address.
-            reset_link (str): The password reset link to include in the email.
-        """
-        return None
-
-    async def send_password_reset_complete_email(
-        self, email: str, login_link: str
-    ) -> None:
-        """
-        Stub implementation for sending a password reset complete email.
-
-        Args:
-            email (str): The recipient's email address.
-            login_link (str): The login link to include in the email.
-        """
-        return None
-
-    async def send_comment_reply_email(
-        self, email: str, parent_preview: str, current_preview: str, reply_link: str
-    ) -> None:
-        return None
-
-    async def send_comment_like_email(
-        self, email: str, parent_preview: str, comment_link: str
-    ) -> None:
-        return None
-
-    async def send_payment_email(self, email: str, header: str, message: str) -> None:
-        return None
+class StubEmailSender(NullEmailSender):
+    """
+    Email sender used by the test suite: every email is dropped.
+    """
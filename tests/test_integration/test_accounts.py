@@ -1110,8 +1110,10 @@ async def test_refresh_access_token_user_not_found(client, db_session, jwt_manag
     invalid_user_id = 9999
     refresh_token = jwt_manager.create_refresh_token({"user_id": invalid_user_id})
 
+    # The record itself must reference an existing user (foreign keys are
+    # enforced); only the user ID inside the token is invalid.
     refresh_token_record = RefreshTokenModel.create(
-        user_id=invalid_user_id, days_valid=7, token=refresh_token
+        user_id=user.id, days_valid=7, token=refresh_token
     )
     db_session.add(refresh_token_record)
     await db_session.commit()
@@ -1182,6 +1184,18 @@ async def test_logout_user_missing_token(client):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.asyncio
+async def test_logout_user_oversized_token(client):
+    """
+    Test logout with an oversized bearer token.
+    Should return 401 Unauthorized before the token is decoded.
+    """
+    headers = {"Authorization": f"Bearer {'a' * 5000}.{'b' * 10}.{'c' * 10}"}
+    response = await client.post("/accounts/logout", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token too large"
+
+
 # @pytest.mark.asyncio(loop_scope="session")
 # async def test_logout_user_invalid_token(client):
 #     """
@@ -1297,3 +1311,31 @@ async def test_get_users_default_parameters(
 
     if group_id in [2, 3]:
         assert len(response_data) == 3, "Expected 3 users in the response"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_group_change_takes_effect_immediately(client, db_session, jwt_manager):
+    """
+    Test that a user's new group applies to their next request, even though
+    the user was just cached by a previous one.
+    """
+    user = (
+        (await db_session.execute(select(UserModel).where(UserModel.group_id == 1)))
+        .scalars()
+        .first()
+    )
+    user_headers = await make_token(user, jwt_manager)
+    admin_headers = await get_headers(db_session, jwt_manager, 3)
+
+    response = await client.get("/moderator/users/", headers=user_headers)
+    assert response.status_code == 403
+
+    response = await client.patch(
+        f"/admin/users/{user.id}/group",
+        json={"group": "moderator"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/moderator/users/", headers=user_headers)
+    assert response.status_code == 200
@@ -177,7 +177,7 @@ async def test_update_comment_not_author(client, db_session, jwt_manager):
 
     comment = MovieCommentModel(
         movie_id=movie_id,
-        user_id=999,
+        user_id=2,
         content="Other user comment",
     )
     db_session.add(comment)
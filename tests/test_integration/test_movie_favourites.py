@@ -37,6 +37,10 @@ async def test_cannot_favorite_twice(client, jwt_manager, db_session):
     assert resp.status_code == 409
     assert resp.json()["detail"] == "Movie is already in your favorites."
 
+    movie = await db_session.get(MovieModel, movie_id)
+    await db_session.refresh(movie)
+    assert movie.favorite_count == 1
+
 
 @pytest.mark.asyncio
 async def test_remove_from_favorites(client, db_session, jwt_manager):
@@ -1,7 +1,8 @@
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from src.database import MovieLikeModel, MovieModel
+from src.routes.utils import toggle_movie_reaction
 from ..utils import get_headers
 
 
@@ -92,3 +93,84 @@ async def test_remove_reaction_not_exists(client, db_session, jwt_manager):
 
     resp = await client.delete("/movies/9999/reaction", headers=headers)
     assert resp.status_code == 404
+
+
+async def _like_count(db_session, movie_id):
+    stmt = select(MovieModel.like_count).where(MovieModel.id == movie_id)
+    return (await db_session.execute(stmt)).scalar_one()
+
+
+async def _counted_likes(db_session, movie_id):
+    stmt = select(func.count()).where(
+        MovieLikeModel.c.movie_id == movie_id, MovieLikeModel.c.like.is_(True)
+    )
+    return (await db_session.execute(stmt)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_like_twice_counts_once(client, db_session, jwt_manager):
+    movie_id = 12
+    headers = await get_headers(db_session, jwt_manager)
+
+    for _ in range(2):
+        resp = await client.post(f"/movies/{movie_id}/like", headers=headers)
+        assert resp.status_code == 204
+
+    assert await _like_count(db_session, movie_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_dislike_twice_after_like(client, db_session, jwt_manager):
+    movie_id = 13
+    headers = await get_headers(db_session, jwt_manager)
+
+    await client.post(f"/movies/{movie_id}/like", headers=headers)
+    for _ in range(2):
+        resp = await client.post(f"/movies/{movie_id}/dislike", headers=headers)
+        assert resp.status_code == 204
+
+    assert await _like_count(db_session, movie_id) == 0
+    stmt = select(MovieLikeModel.c.like).where(
+        MovieLikeModel.c.user_id == 3,
+        MovieLikeModel.c.movie_id == movie_id,
+    )
+    assert (await db_session.execute(stmt)).scalar_one() is False
+
+
+@pytest.mark.asyncio
+async def test_reaction_sequence_keeps_like_count_consistent(
+    client, db_session, jwt_manager
+):
+    movie_id = 14
+    headers = await get_headers(db_session, jwt_manager)
+
+    steps = [
+        ("post", "like"),
+        ("post", "dislike"),
+        ("post", "like"),
+        ("post", "like"),
+        ("delete", "reaction"),
+        ("post", "dislike"),
+        ("post", "dislike"),
+        ("post", "like"),
+    ]
+    for method, action in steps:
+        resp = await client.request(
+            method.upper(), f"/movies/{movie_id}/{action}", headers=headers
+        )
+        assert resp.status_code == 204
+        assert await _like_count(db_session, movie_id) == await _counted_likes(
+            db_session, movie_id
+        ), f"like_count out of sync after {method} {action}"
+
+    assert await _like_count(db_session, movie_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_toggle_movie_reaction_is_idempotent(db_session):
+    movie_id = 15
+
+    for is_like in (True, True, False, False, True):
+        await toggle_movie_reaction(db_session, 3, movie_id, is_like=is_like)
+        assert await _like_count(db_session, movie_id) == int(is_like)
+        assert await _counted_likes(db_session, movie_id) == int(is_like)
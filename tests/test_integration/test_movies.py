@@ -1,17 +1,23 @@
 import random
 import string
 import pytest
-from sqlalchemy import select, func
+from sqlalchemy import event, insert, select, func
 from sqlalchemy.orm import joinedload
 
 from src.database import (
     MovieModel,
+    MovieGenreModel,
+    MovieStarModel,
+    MovieDirectorModel,
+    MovieLikeModel,
+    UserFavoriteMovieModel,
     UserModel,
     OrderItemModel,
     OrderModel,
     OrderStatusEnum,
 )
 
+from src.database.session_sqlite import sqlite_engine
 from ..utils import make_token, get_headers
 
 
@@ -30,6 +36,29 @@ async def test_get_movies_empty_database(client):
     ), f"Expected {expected_detail}, got {response.json()}"
 
 
+@pytest.mark.asyncio
+async def test_get_movies_does_not_load_relationships(client):
+    """
+    Test that the `/movies/` endpoint runs only the count and page queries,
+    without loading any per-movie relationships.
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        response = await client.get("/movies/")
+    finally:
+        event.remove(
+            sqlite_engine.sync_engine, "before_cursor_execute", record_statement
+        )
+
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert len(statements) <= 2, f"Expected at most 2 queries, got {statements}"
+
+
 @pytest.mark.asyncio
 async def test_get_movies_default_parameters(client):
     """
@@ -521,6 +550,44 @@ async def test_delete_movie_success(client, db_session, jwt_manager):
     assert deleted_movie is None, f"Movie with ID 5 was not deleted."
 
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_delete_movie_removes_link_rows(client, db_session, jwt_manager):
+    """
+    Test that deleting a movie also removes its genre, star, director,
+    favorite and like rows.
+    """
+    movie_id = 5
+    await db_session.execute(
+        insert(UserFavoriteMovieModel).values(user_id=3, movie_id=movie_id)
+    )
+    await db_session.execute(
+        insert(MovieLikeModel).values(user_id=3, movie_id=movie_id, like=True)
+    )
+    await db_session.commit()
+
+    link_tables = [
+        MovieGenreModel,
+        MovieStarModel,
+        MovieDirectorModel,
+        UserFavoriteMovieModel,
+        MovieLikeModel,
+    ]
+
+    async def count_links(table):
+        stmt = select(func.count()).where(table.c.movie_id == movie_id)
+        return (await db_session.execute(stmt)).scalar_one()
+
+    for table in link_tables:
+        assert await count_links(table) > 0, f"No {table.name} rows to delete."
+
+    headers = await get_headers(db_session, jwt_manager, 2)
+    response = await client.delete(f"/moderator/movies/{movie_id}/", headers=headers)
+    assert response.status_code == 204
+
+    for table in link_tables:
+        assert await count_links(table) == 0, f"{table.name} rows were left behind."
+
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_delete_movie_not_found(client, db_session, jwt_manager):
     """
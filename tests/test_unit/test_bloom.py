@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from src.security.bloom import BloomFilter
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+def test_added_keys_are_members():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    keys = [os.urandom(16) for _ in range(100)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for _ in range(1000):
+        bloom.add(os.urandom(16))
+
+    false_positives = sum(os.urandom(16) in bloom for _ in range(10_000))
+    assert false_positives < 300
+
+
+def test_adding_a_key_twice_counts_it_once():
+    bloom = BloomFilter(capacity=10, error_rate=0.01)
+    key = os.urandom(16)
+    bloom.add(key)
+    bloom.add(key)
+
+    assert bloom.count == 1
+
+
+def test_clear_removes_all_keys():
+    bloom = BloomFilter(capacity=10, error_rate=0.01)
+    key = os.urandom(16)
+    bloom.add(key)
+    bloom.clear()
+
+    assert key not in bloom
+    assert bloom.count == 0
@@ -0,0 +1,89 @@
+import pytest
+
+from src.security import cache as cache_module
+from src.security.cache import TTLCache
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("key", "value")
+
+    clock.now += 29
+    assert cache.get("key") == "value"
+
+    clock.now += 1
+    assert cache.get("key") is None
+    assert "key" not in cache
+    assert len(cache) == 0
+
+
+def test_ttl_override_applies_to_one_entry(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("short", 1, ttl=5)
+    cache.set("default", 2)
+
+    clock.now += 5
+    assert "short" not in cache
+    assert cache.get("default") == 2
+
+
+def test_non_positive_ttl_removes_entry(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("key", "value")
+    cache.set("key", "new value", ttl=0)
+
+    assert "key" not in cache
+
+
+def test_maxsize_evicts_oldest_entry(clock):
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Re-setting an entry makes it the newest one.
+    cache.set("a", 3)
+    cache.set("c", 4)
+
+    assert "b" not in cache
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+    assert len(cache) == 2
+
+
+def test_pop_returns_live_value_and_removes_it(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("live", 1)
+    cache.set("expired", 2, ttl=1)
+    clock.now += 1
+
+    assert cache.pop("live") == 1
+    assert "live" not in cache
+    assert cache.pop("expired", "default") == "default"
+    assert cache.pop("missing") is None
+    assert len(cache) == 0
+
+
+def test_clear_removes_all_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.notifications.delivery import DeliveryExecutor
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+class RecordingDeliver:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        return [f"sent {item}" for item in items]
+
+
+async def test_full_batch_is_flushed_without_waiting():
+    deliver = RecordingDeliver()
+    executor = DeliveryExecutor(deliver, max_batch=3, max_wait=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(executor.submit(i) for i in range(3))), timeout=5
+    )
+
+    assert results == ["sent 0", "sent 1", "sent 2"]
+    assert deliver.batches == [[0, 1, 2]]
+
+
+async def test_items_beyond_max_batch_go_into_the_next_batch():
+    deliver = RecordingDeliver()
+    executor = DeliveryExecutor(deliver, max_batch=2, max_wait=0.01)
+
+    await asyncio.gather(*(executor.submit(i) for i in range(5)))
+
+    assert deliver.batches == [[0, 1], [2, 3], [4]]
+
+
+async def test_partial_batch_is_flushed_at_the_deadline():
+    deliver = RecordingDeliver()
+    executor = DeliveryExecutor(deliver, max_batch=10, max_wait=0.05)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    results = await asyncio.wait_for(
+        asyncio.gather(executor.submit("a"), executor.submit("b")), timeout=5
+    )
+
+    assert results == ["sent a", "sent b"]
+    assert deliver.batches == [["a", "b"]]
+    assert loop.time() - started >= 0.05
+
+
+async def test_delivery_error_is_raised_for_every_item_of_the_batch():
+    async def deliver(items):
+        raise RuntimeError("server down")
+
+    executor = DeliveryExecutor(deliver, max_batch=2, max_wait=0.01)
+
+    results = await asyncio.gather(
+        executor.submit(1), executor.submit(2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_close_waits_for_pending_deliveries():
+    delivered = []
+
+    async def deliver(items):
+        await asyncio.sleep(0.01)
+        delivered.extend(items)
+        return [None] * len(items)
+
+    executor = DeliveryExecutor(deliver, max_batch=10, max_wait=0.01)
+    pending = asyncio.ensure_future(executor.submit("item"))
+    await asyncio.sleep(0)
+    await executor.close()
+
+    assert delivered == ["item"]
+    await pending
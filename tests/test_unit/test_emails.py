@@ -0,0 +1,113 @@
+import aiosmtplib
+import pytest
+
+from src.config.get_settings import get_settings
+from src.notifications.emails import EmailSender
+from src.notifications.interfaces import EmailKind
+from src.notifications.payloads import ActivationCtx, CommentLikeCtx, PaymentCtx
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+@pytest.fixture
+def email_sender():
+    settings = get_settings()
+    return EmailSender(
+        hostname=settings.EMAIL_HOST,
+        port=settings.EMAIL_PORT,
+        email=settings.EMAIL_HOST_USER,
+        password=settings.EMAIL_HOST_PASSWORD,
+        use_tls=settings.EMAIL_USE_TLS,
+        template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
+        activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
+        activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
+        password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
+        password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME,
+        comment_reply_template_name=settings.COMMENT_REPLY_TEMPLATE_NAME,
+        comment_like_template_name=settings.COMMENT_LIKE_TEMPLATE_NAME,
+        payment_email_template_name=settings.PAYMENT_EMAIL_TEMPLATE_NAME,
+    )
+
+
+def test_payment_email_breaks_lines_and_escapes_values(email_sender):
+    ctx = PaymentCtx(
+        "user@example.com",
+        "Payment failed",
+        "Your payment for order 1 failed.\nReason: <card declined>",
+    )
+
+    message = email_sender._render(EmailKind.PAYMENT, ctx)
+
+    assert "failed.<br />" in message.html_content
+    assert "Reason: &lt;card declined&gt;" in message.html_content
+    assert "&lt;br" not in message.html_content
+    assert message.text_content == (
+        "Payment failed\n\n"
+        "Your payment for order 1 failed.\nReason: <card declined>\n"
+    )
+
+
+@pytest.fixture
+def deliveries(email_sender, monkeypatch):
+    outgoing = []
+
+    async def deliver(messages):
+        outgoing.extend(messages)
+        return [None] * len(messages)
+
+    monkeypatch.setattr(email_sender, "_deliver", deliver)
+    return outgoing
+
+
+async def test_send_many_gives_each_recipient_their_own_address(
+    email_sender, deliveries
+):
+    recipients = ["first@example.com", "second@example.com"]
+    ctx = ActivationCtx("first@example.com", "http://test/activate")
+
+    await email_sender.send_many(EmailKind.ACTIVATION, recipients, ctx)
+
+    assert [envelope for envelope, _ in deliveries] == [[r] for r in recipients]
+    for (recipient,), mime in deliveries:
+        other = next(r for r in recipients if r != recipient)
+        assert f"To: {recipient}" in mime
+        assert recipient in mime.split("\n\n", 1)[1]
+        assert other not in mime
+
+
+async def test_send_many_shares_one_transaction_without_addresses(
+    email_sender, deliveries
+):
+    recipients = ["first@example.com", "second@example.com"]
+    ctx = CommentLikeCtx("first@example.com", "Nice movie", "http://test/comment")
+
+    await email_sender.send_many(EmailKind.COMMENT_LIKE, recipients, ctx)
+
+    assert len(deliveries) == 1
+    envelope, mime = deliveries[0]
+    assert envelope == recipients
+    assert "To: undisclosed-recipients:;" in mime
+    assert not any(recipient in mime for recipient in recipients)
+
+
+async def test_busy_reply_throttles_sends(email_sender, monkeypatch):
+    async def sendmail_many(sender, messages):
+        return [aiosmtplib.SMTPResponseException(421, "Try again later")]
+
+    monkeypatch.setattr(email_sender._pool, "sendmail_many", sendmail_many)
+
+    errors = await email_sender._deliver([(["user@example.com"], "message")])
+
+    assert errors[0].code == 421
+    assert email_sender._limiter.backoff_active
+
+
+async def test_other_errors_do_not_throttle_sends(email_sender, monkeypatch):
+    async def sendmail_many(sender, messages):
+        return [aiosmtplib.SMTPResponseException(550, "No such user")]
+
+    monkeypatch.setattr(email_sender._pool, "sendmail_many", sendmail_many)
+
+    await email_sender._deliver([(["user@example.com"], "message")])
+
+    assert not email_sender._limiter.backoff_active
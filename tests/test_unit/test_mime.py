@@ -0,0 +1,69 @@
+import email
+from email import policy
+
+import pytest
+
+from src.notifications.interfaces import EmailMessage
+from src.notifications.mime import build_mime
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+def parse(mime: str) -> email.message.EmailMessage:
+    return email.message_from_bytes(mime.encode("ascii"), policy=policy.default)
+
+
+def test_ascii_message_round_trips():
+    message = EmailMessage(
+        "user@example.com", "Welcome", "<p>Hello</p>", "Hello"
+    )
+
+    parsed = parse(build_mime("Cinema <noreply@example.com>", message))
+
+    assert parsed["From"] == "Cinema <noreply@example.com>"
+    assert parsed["To"] == "user@example.com"
+    assert parsed["Subject"] == "Welcome"
+    assert parsed.get_content_type() == "multipart/alternative"
+    assert parsed.get_body(("plain",)).get_content().strip() == "Hello"
+    assert parsed.get_body(("html",)).get_content().strip() == "<p>Hello</p>"
+
+
+def test_non_ascii_headers_and_bodies_round_trip():
+    message = EmailMessage(
+        "user@example.com",
+        "Оплата пройшла ✓",
+        "<p>Дякуємо, Zoë! 🎬</p>",
+        "Дякуємо, Zoë! 🎬",
+    )
+
+    mime = build_mime("Кінотеатр <noreply@example.com>", message)
+
+    assert mime.isascii()
+    parsed = parse(mime)
+    assert parsed["From"] == "Кінотеатр <noreply@example.com>"
+    assert parsed["Subject"] == "Оплата пройшла ✓"
+    assert parsed.get_body(("plain",)).get_content().strip() == "Дякуємо, Zoë! 🎬"
+    assert (
+        parsed.get_body(("html",)).get_content().strip() == "<p>Дякуємо, Zoë! 🎬</p>"
+    )
+
+
+def test_html_only_message_has_a_single_part():
+    message = EmailMessage("user@example.com", "Héllo", "<p>Ünïcode</p>")
+
+    parsed = parse(build_mime("noreply@example.com", message))
+
+    assert parsed.get_content_type() == "text/html"
+    assert parsed["Subject"] == "Héllo"
+    assert parsed.get_content().strip() == "<p>Ünïcode</p>"
+
+
+def test_line_breaks_cannot_inject_headers():
+    message = EmailMessage(
+        "user@example.com", "Hi\nBcc: victim@example.com", "<p>Hi</p>"
+    )
+
+    parsed = parse(build_mime("noreply@example.com", message))
+
+    assert parsed["Bcc"] is None
+    assert "victim@example.com" in parsed["Subject"]
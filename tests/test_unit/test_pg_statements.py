@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.routes.utils import activate_user_by_token, reset_password_with_token
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+class RecordingSession:
+    """
+    Stands in for a PostgreSQL session: records statements instead of
+    running them, and answers them with `scalar`.
+    """
+
+    def __init__(self, scalar=None):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.statements = []
+        self._scalar = scalar
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar=lambda: self._scalar)
+
+
+def compile_pg(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return " ".join(str(compiled).split()), compiled.params
+
+
+async def test_activation_is_one_cte_statement():
+    db = RecordingSession(scalar=7)
+
+    assert await activate_user_by_token(db, "user@example.com", "token") is True
+
+    (statement,) = db.statements
+    sql, _ = compile_pg(statement)
+    assert sql.startswith(
+        "WITH used_token AS (DELETE FROM activation_tokens USING users WHERE"
+    )
+    assert "RETURNING activation_tokens.user_id)" in sql
+    assert "UPDATE users SET is_active=" in sql
+    assert "WHERE users.id IN (SELECT used_token.user_id FROM used_token)" in sql
+    assert sql.endswith("RETURNING users.id")
+
+
+async def test_activation_only_consumes_unexpired_tokens():
+    db = RecordingSession(scalar=None)
+    before = datetime.now(timezone.utc)
+
+    # An expired (or otherwise invalid) token matches no row; the route then
+    # falls through to the lookup that tells the errors apart.
+    assert await activate_user_by_token(db, "user@example.com", "token") is False
+
+    sql, params = compile_pg(db.statements[0])
+    assert "activation_tokens.expires_at > %(expires_at_1)s" in sql
+    cutoff = params["expires_at_1"]
+    assert before <= cutoff <= datetime.now(timezone.utc)
+    assert "users.is_active IS false" in sql
+    assert params["token_1"] == "token"
+    assert params["email_1"] == "user@example.com"
+
+
+async def test_password_reset_is_one_cte_statement():
+    db = RecordingSession()
+
+    await reset_password_with_token(db, user_id=3, token_id=11, hashed_password="h")
+
+    (statement,) = db.statements
+    sql, params = compile_pg(statement)
+    assert sql.startswith(
+        "WITH used_token AS (DELETE FROM password_reset_tokens "
+        "WHERE password_reset_tokens.id = %(id_1)s)"
+    )
+    assert "UPDATE users SET hashed_password=%(hashed_password)s" in sql
+    assert "WHERE users.id = %(id_2)s" in sql
+    assert params["id_1"] == 11
+    assert params["id_2"] == 3
+    assert params["hashed_password"] == "h"
+
+
+async def test_password_reset_without_ctes_elsewhere():
+    db = RecordingSession()
+    db.bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    await reset_password_with_token(db, user_id=3, token_id=11, hashed_password="h")
+
+    delete_sql, _ = compile_pg(db.statements[0])
+    update_sql, _ = compile_pg(db.statements[1])
+    assert delete_sql.startswith("DELETE FROM password_reset_tokens")
+    assert update_sql.startswith("UPDATE users SET hashed_password=")
+    assert all("WITH" not in compile_pg(s)[0] for s in db.statements)
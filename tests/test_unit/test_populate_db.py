@@ -0,0 +1,21 @@
+import pytest
+
+from src.database.populate_db import (
+    INDEX_REBUILD_THRESHOLD,
+    NUM_MOVIES,
+    _secondary_movie_indexes,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+def test_default_seed_rebuilds_indexes():
+    assert NUM_MOVIES > INDEX_REBUILD_THRESHOLD
+
+
+def test_only_secondary_movie_indexes_are_rebuilt():
+    indexes = _secondary_movie_indexes()
+
+    assert indexes
+    assert not any(index.unique for index in indexes)
+    assert all(index.table.name == "movies" for index in indexes)
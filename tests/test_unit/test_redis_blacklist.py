@@ -0,0 +1,191 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import aioredis
+import pytest
+
+from src.security.bloom import BloomFilter
+from src.security.cache import TTLCache
+from src.tasks import redis_blacklist
+from src.tasks.redis_blacklist import (
+    _load_revoked_filter,
+    _on_message,
+    _revoked_key,
+    is_token_revoked,
+    revoke_token,
+    token_cache_key,
+    user_invalidation_message,
+)
+from ..utils import FakeRedis
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+class FakePubSub:
+    """Replays scripted `get_message` results, then fails like a dropped link."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.pings = 0
+        self.closed = False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, timeout=0.0):
+        if not self.messages:
+            raise aioredis.ConnectionError("connection lost")
+        return self.messages.pop(0)
+
+    async def ping(self):
+        self.pings += 1
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def revocation_state(monkeypatch):
+    monkeypatch.setattr(
+        redis_blacklist, "_revoked_filter", BloomFilter(1000, 0.001)
+    )
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_ready", False)
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_heard_at", 0.0)
+    redis_blacklist._not_revoked_cache.clear()
+    yield
+    redis_blacklist._not_revoked_cache.clear()
+
+
+async def test_filter_not_ready_asks_redis(revocation_state):
+    redis = FakeRedis()
+    token = "revoked-elsewhere"
+    await redis.set(_revoked_key(token_cache_key(token)), "1")
+
+    assert await is_token_revoked(token, redis) is True
+
+
+async def test_silent_listener_filter_is_not_trusted(revocation_state, monkeypatch):
+    redis = FakeRedis()
+    token = "revoked-elsewhere"
+    await redis.set(_revoked_key(token_cache_key(token)), "1")
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_ready", True)
+    monkeypatch.setattr(
+        redis_blacklist,
+        "_revoked_filter_heard_at",
+        time.monotonic() - redis_blacklist.LISTENER_SILENCE_LIMIT - 1,
+    )
+
+    assert await is_token_revoked(token, redis) is True
+
+
+async def test_synced_filter_miss_skips_redis(revocation_state, monkeypatch):
+    redis = FakeRedis()
+    token = "never-revoked"
+    # Only reachable through Redis: a filter miss must answer on its own.
+    await redis.set(_revoked_key(token_cache_key(token)), "1")
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_ready", True)
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_heard_at", time.monotonic())
+
+    assert await is_token_revoked(token, redis) is False
+
+
+async def test_synced_filter_hit_is_confirmed_in_redis(revocation_state, monkeypatch):
+    redis = FakeRedis()
+    token = "revoked-here"
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_ready", True)
+    monkeypatch.setattr(redis_blacklist, "_revoked_filter_heard_at", time.monotonic())
+    await revoke_token(token, datetime.now(timezone.utc) + timedelta(minutes=5), redis)
+
+    assert await is_token_revoked(token, redis) is True
+
+
+async def test_malformed_messages_are_skipped(revocation_state):
+    _on_message("not-hex")
+    _on_message("user:not-an-id")
+
+    assert redis_blacklist._revoked_filter.count == 0
+
+
+async def test_user_invalidation_message_evicts_cached_user(revocation_state):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(3, "user")
+    cache.set(4, "other user")
+    redis_blacklist.evict_on_user_invalidation(cache)
+    try:
+        _on_message(user_invalidation_message(3))
+    finally:
+        redis_blacklist._user_caches.remove(cache)
+
+    assert 3 not in cache
+    assert 4 in cache
+    assert redis_blacklist._revoked_filter.count == 0
+
+
+async def test_load_sizes_filter_from_live_keys(revocation_state, monkeypatch):
+    monkeypatch.setattr(redis_blacklist, "REVOKED_FILTER_CAPACITY", 1)
+    redis = FakeRedis()
+    digests = [token_cache_key(f"token-{i}") for i in range(3)]
+    for digest in digests:
+        await redis.set(_revoked_key(digest), "1")
+    # Revoked before entries were keyed by digest.
+    await redis.set("revoked:legacy-token", "1")
+
+    revoked_filter = await _load_revoked_filter(redis)
+
+    assert revoked_filter.capacity == 8
+    assert all(digest in revoked_filter for digest in digests)
+    assert token_cache_key("legacy-token") in revoked_filter
+
+
+async def test_listener_applies_revocations_until_disconnected(
+    revocation_state, monkeypatch
+):
+    redis = FakeRedis()
+    digest = token_cache_key("revoked-elsewhere")
+    redis_blacklist._not_revoked_cache.set(digest, True)
+    pubsub = FakePubSub(
+        [
+            {"type": "subscribe", "data": 1},
+            {"type": "message", "data": "not-hex"},
+            None,
+            {"type": "pong", "data": ""},
+            {"type": "message", "data": digest.hex()},
+        ]
+    )
+    redis.pubsub = lambda: pubsub
+
+    async def get_fake_redis():
+        return redis
+
+    monkeypatch.setattr(redis_blacklist, "get_redis", get_fake_redis)
+
+    with pytest.raises(aioredis.ConnectionError):
+        await redis_blacklist._follow_revocations()
+
+    assert digest in redis_blacklist._revoked_filter
+    assert digest not in redis_blacklist._not_revoked_cache
+    assert pubsub.pings == 1
+    assert pubsub.closed
+
+
+async def test_listener_retries_after_failure(revocation_state, monkeypatch):
+    calls = 0
+    retried = asyncio.Event()
+
+    async def follow_revocations():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            retried.set()
+            await asyncio.Event().wait()
+        raise aioredis.ConnectionError("connection refused")
+
+    monkeypatch.setattr(redis_blacklist, "_follow_revocations", follow_revocations)
+    listener = asyncio.create_task(redis_blacklist.listen_for_revocations())
+    try:
+        await asyncio.wait_for(retried.wait(), timeout=5)
+    finally:
+        listener.cancel()
+
+    assert redis_blacklist._revoked_filter_ready is False
@@ -0,0 +1,28 @@
+import inspect
+
+import pytest
+
+from src.config.get_settings import get_app_settings, get_settings
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+@pytest.fixture
+def fresh_settings():
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+async def test_settings_dependency_is_async_and_cached(fresh_settings):
+    # FastAPI only runs plain `def` dependencies in its threadpool.
+    assert inspect.iscoroutinefunction(get_app_settings)
+    assert await get_app_settings() is await get_app_settings()
+    assert await get_app_settings() is get_settings()
+
+
+def test_cache_clear_rebuilds_settings(fresh_settings):
+    settings = get_settings()
+    get_settings.cache_clear()
+
+    assert get_settings() is not settings
@@ -0,0 +1,160 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from src.notifications import smtp_pool
+from src.notifications.smtp_pool import SMTPConnectionPool, _PooledConnection
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+class FakeSMTP:
+    """Records what is sent; fails a command when told to."""
+
+    def __init__(self):
+        self.sent = []
+        self.noops = 0
+        self.closed = False
+        self.quit_called = False
+        self.fail_noop = False
+        self.fail_sendmail: Exception | None = None
+
+    async def sendmail(self, sender, recipients, message):
+        if self.fail_sendmail is not None:
+            raise self.fail_sendmail
+        self.sent.append((sender, recipients, message))
+
+    async def noop(self):
+        self.noops += 1
+        if self.fail_noop:
+            raise aiosmtplib.SMTPResponseException(421, "Closing connection")
+
+    async def quit(self):
+        self.quit_called = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(smtp_pool, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Every connection the pool opened, in order."""
+    opened = []
+
+    async def connect(self):
+        client = FakeSMTP()
+        opened.append(client)
+        return _PooledConnection(client)
+
+    monkeypatch.setattr(SMTPConnectionPool, "_connect", connect)
+    return opened
+
+
+def make_pool(**kwargs):
+    return SMTPConnectionPool(
+        hostname="smtp.test",
+        port=25,
+        email="sender@test",
+        password="secret",
+        use_tls=False,
+        **kwargs,
+    )
+
+
+async def test_recently_used_connection_is_reused_without_noop(clock, connections):
+    pool = make_pool(ping_after=30)
+    await pool.sendmail("sender@test", ["a@test"], "first")
+    clock.now += 10
+    await pool.sendmail("sender@test", ["b@test"], "second")
+
+    assert len(connections) == 1
+    assert connections[0].noops == 0
+    assert len(connections[0].sent) == 2
+
+
+async def test_idle_connection_is_checked_with_noop(clock, connections):
+    pool = make_pool(ping_after=30)
+    await pool.sendmail("sender@test", ["a@test"], "first")
+    clock.now += 31
+    await pool.sendmail("sender@test", ["b@test"], "second")
+
+    assert len(connections) == 1
+    assert connections[0].noops == 1
+
+
+async def test_connection_failing_noop_is_replaced(clock, connections):
+    pool = make_pool(ping_after=30)
+    await pool.sendmail("sender@test", ["a@test"], "first")
+    connections[0].fail_noop = True
+    clock.now += 31
+    await pool.sendmail("sender@test", ["b@test"], "second")
+
+    assert len(connections) == 2
+    assert connections[0].closed
+    assert connections[1].sent[0][2] == "second"
+
+
+async def test_connection_is_recycled_after_message_limit(clock, connections):
+    pool = make_pool(messages_per_connection=2)
+    errors = await pool.sendmail_many(
+        "sender@test", [(["a@test"], "1"), (["b@test"], "2"), (["c@test"], "3")]
+    )
+
+    assert errors == [None, None, None]
+    assert len(connections) == 2
+    assert connections[0].quit_called
+    assert [message for _, _, message in connections[0].sent] == ["1", "2"]
+    assert [message for _, _, message in connections[1].sent] == ["3"]
+
+
+async def test_disconnected_pooled_connection_is_reconnected(clock, connections):
+    pool = make_pool()
+    await pool.sendmail("sender@test", ["a@test"], "first")
+    connections[0].fail_sendmail = aiosmtplib.SMTPServerDisconnected("gone")
+
+    await pool.sendmail("sender@test", ["b@test"], "second")
+
+    assert len(connections) == 2
+    assert connections[0].closed
+    assert connections[1].sent[0][2] == "second"
+
+
+async def test_failed_message_does_not_abort_the_batch(clock, connections):
+    pool = make_pool()
+    await pool.sendmail("sender@test", ["a@test"], "first")
+    connections[0].fail_sendmail = aiosmtplib.SMTPRecipientsRefused([])
+
+    errors = await pool.sendmail_many(
+        "sender@test", [(["bad@test"], "refused"), (["b@test"], "next")]
+    )
+
+    assert isinstance(errors[0], aiosmtplib.SMTPRecipientsRefused)
+    assert errors[1] is None
+    assert connections[0].closed
+    assert connections[1].sent[0][2] == "next"
+
+
+def test_idle_connections_are_closed_when_used_from_another_loop(connections):
+    pool = make_pool()
+    asyncio.run(pool.sendmail("sender@test", ["a@test"], "first"))
+    asyncio.run(pool.sendmail("sender@test", ["b@test"], "second"))
+
+    assert len(connections) == 2
+    assert connections[0].closed
+    assert not connections[1].closed
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src.notifications.throttle import SendLimiter
+
+pytestmark = [pytest.mark.unit, pytest.mark.no_seed]
+
+
+async def _hold(limiter, size, entered, release):
+    async with limiter.limit(size):
+        entered.set()
+        await release.wait()
+
+
+async def _enters_promptly(limiter, size):
+    async def enter():
+        async with limiter.limit(size):
+            pass
+
+    try:
+        await asyncio.wait_for(enter(), timeout=0.05)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+async def test_sends_run_concurrently_without_backoff():
+    limiter = SendLimiter(concurrency=10, throttled_concurrency=1, byte_budget=100)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, 10, entered, release))
+    await entered.wait()
+
+    assert not limiter.backoff_active
+    assert await _enters_promptly(limiter, 10)
+
+    release.set()
+    await holder
+
+
+async def test_backoff_limits_concurrent_sends():
+    limiter = SendLimiter(concurrency=10, throttled_concurrency=1, byte_budget=100)
+    limiter.set_backoff(60)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, 1, entered, release))
+    await entered.wait()
+
+    assert limiter.backoff_active
+    assert not await _enters_promptly(limiter, 1)
+
+    release.set()
+    await holder
+    assert await _enters_promptly(limiter, 1)
+
+
+async def test_backoff_charges_sizes_with_the_penalty():
+    limiter = SendLimiter(
+        concurrency=10, throttled_concurrency=10, byte_budget=100, backoff_penalty=4
+    )
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, 40, entered, release))
+    await entered.wait()
+
+    # 40 bytes are reserved; 40 more fit, but not 40 * 4 while backing off.
+    assert await _enters_promptly(limiter, 40)
+    limiter.set_backoff(60)
+    assert not await _enters_promptly(limiter, 40)
+
+    release.set()
+    await holder
+
+
+async def test_backoff_expires():
+    limiter = SendLimiter()
+    limiter.set_backoff(0.01)
+    assert limiter.backoff_active
+
+    await asyncio.sleep(0.02)
+
+    assert not limiter.backoff_active
@@ -31,12 +31,50 @@ class FakeRedis:
     async def get(self, key):
         return self.store.get(key)
 
+    async def exists(self, *keys):
+        return sum(1 for key in keys if key in self.store)
+
+    async def publish(self, channel, message):
+        return 0
+
     async def delete(self, key):
         if key in self.store:
             del self.store[key]
 
+    async def scan_iter(self, match=None, count=None):
+        for key in await self.keys(match):
+            yield key
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
     async def keys(self, pattern):
         # Very simple pattern support for "revoked:*"
         if pattern == "revoked:*":
             return [k for k in self.store.keys() if k.startswith("revoked:")]
         return []
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]